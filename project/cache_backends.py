@@ -0,0 +1,505 @@
+import hashlib
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+from project.decorators import MISSING
+
+KEY_PROTOCOL = 4
+
+
+def key_bytes(key: Any) -> bytes:
+    """
+    Serializes a cache key into bytes that are the same in every process.
+    `pickle` alone is not enough: the iteration order of frozensets of strings
+    depends on the hash seed of the process, so their items are sorted by
+    their own serialization.
+
+    Args:
+        key (Any): a key made by `make_key` or a user key function.
+
+    Returns:
+        result (bytes): the serialized key.
+    """
+
+    if isinstance(key, tuple):
+        parts = [key_bytes(item) for item in key]
+        tag = b"t"
+    elif isinstance(key, frozenset):
+        parts = sorted(key_bytes(item) for item in key)
+        tag = b"f"
+    else:
+        return b"p" + pickle.dumps(key, protocol=KEY_PROTOCOL)
+    return tag + b"".join(
+        len(part).to_bytes(4, "little") + part for part in parts
+    )
+
+
+def key_digest(key: Any) -> bytes:
+    """
+    Returns a fixed-size digest of the serialized key for indexing stores.
+    """
+
+    return hashlib.blake2b(key_bytes(key), digest_size=20).digest()
+
+
+class CacheBackend:
+    """
+    Interface of the second tier of `cache_decorator`, given by its `backend`
+    argument. A backend holds pickled results outside of the process memory,
+    so they survive restarts or are shared by processes, and it enforces its
+    own limits.
+
+    Methods:
+    -------
+    `get(key: Any) -> Any`:
+        Returns the stored value or `MISSING`.
+
+    `set(key: Any, value: Any, ttl: Optional[float]) -> None`:
+        Stores the value, valid for `ttl` seconds if it is given.
+
+    `delete(key: Any) -> None`:
+        Removes the key if it is stored.
+
+    `clear() -> None`:
+        Removes all entries.
+    """
+
+    def get(self, key: Any) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: Any) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    A cache on a local SQLite database, safe to share between the threads and
+    the processes of one host. The database runs in the WAL mode, so readers
+    do not block the writer. Every thread (and every process after a fork)
+    opens its own connection.
+
+    Entries are evicted in the "lru" (least recently read) or "fifo" (oldest)
+    order until both `max_entries` and `max_bytes` fit, and expired entries are
+    removed on reads and writes. Expiry uses the wall clock, shared by all
+    processes.
+
+    Methods:
+    -------
+    `get(key: Any) -> Any`, `set(key: Any, value: Any, ttl: Optional[float]) -> None`:
+        Read and write entries.
+
+    `delete(key: Any) -> None`, `clear() -> None`:
+        Remove entries.
+
+    `close() -> None`:
+        Closes the connection of the calling thread.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        policy: str = "lru",
+        timeout: float = 30.0,
+    ) -> None:
+        """
+        Initializes a SQLiteBackend object and creates the database.
+
+        Args:
+            path (str): the database file.
+            max_entries (Optional[int]): the maximum number of entries.
+            max_bytes (Optional[int]): the maximum total size of the pickled
+                values.
+            policy (str): the eviction order, "lru" or "fifo".
+            timeout (float): seconds to wait for the lock of another writer.
+        """
+        if policy not in ("lru", "fifo"):
+            raise ValueError(f"Unknown cache policy '{policy}'.")
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.timeout = timeout
+        self._local = threading.local()
+
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key BLOB PRIMARY KEY, value BLOB NOT NULL, "
+                "size INTEGER NOT NULL, expires REAL, used REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_used ON entries (used)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS entries_expires "
+                "ON entries (expires) WHERE expires IS NOT NULL"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Returns the connection of the calling thread and process.
+        """
+
+        connection = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key: Any) -> Any:
+        """
+        Returns the stored value or `MISSING`.
+        """
+
+        connection = self._connection()
+        digest = key_digest(key)
+        row = connection.execute(
+            "SELECT value, expires FROM entries WHERE key = ?", (digest,)
+        ).fetchone()
+        if row is None:
+            return MISSING
+        value, expires = row
+        now = time.time()
+        if expires is not None and expires <= now:
+            connection.execute("DELETE FROM entries WHERE key = ?", (digest,))
+            return MISSING
+        if self.policy == "lru":
+            connection.execute(
+                "UPDATE entries SET used = ? WHERE key = ?", (now, digest)
+            )
+        return pickle.loads(value)
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores the value and evicts entries until the limits fit. Values larger
+        than `max_bytes` are not stored.
+        """
+
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if self.max_bytes is not None and len(data) > self.max_bytes:
+            return
+        now = time.time()
+        expires = None if ttl is None else now + ttl
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "DELETE FROM entries WHERE expires <= ?", (now,)
+            )
+            connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key_digest(key), data, len(data), expires, now),
+            )
+            self._evict(connection)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """
+        Deletes the entries first in the eviction order until the limits fit.
+        """
+
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        count, total = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        excess_entries = count - (self.max_entries or count)
+        excess_bytes = total - (self.max_bytes or total)
+        if excess_entries <= 0 and excess_bytes <= 0:
+            return
+        victims = []
+        for digest, size in connection.execute(
+            "SELECT key, size FROM entries ORDER BY used"
+        ):
+            if excess_entries <= 0 and excess_bytes <= 0:
+                break
+            victims.append((digest,))
+            excess_entries -= 1
+            excess_bytes -= size
+        connection.executemany("DELETE FROM entries WHERE key = ?", victims)
+
+    def delete(self, key: Any) -> None:
+        """
+        Removes the key if it is stored.
+        """
+
+        self._connection().execute(
+            "DELETE FROM entries WHERE key = ?", (key_digest(key),)
+        )
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+
+        self._connection().execute("DELETE FROM entries")
+
+    def __len__(self) -> int:
+        return int(
+            self._connection()
+            .execute(
+                "SELECT COUNT(*) FROM entries "
+                "WHERE expires IS NULL OR expires > ?",
+                (time.time(),),
+            )
+            .fetchone()[0]
+        )
+
+    def close(self) -> None:
+        """
+        Closes the connection of the calling thread.
+        """
+
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+
+class SharedMemoryBackend(CacheBackend):
+    """
+    A cache shared by the processes of one host through a memory-mapped file,
+    without a manager process. Put the file on a RAM file system such as
+    `/dev/shm` to keep it out of the disk.
+
+    The file holds a set-associative hash table: a key is hashed to a group of
+    `ways` slots and may only live in that group, so a lookup reads at most
+    `ways` slots and a full group evicts its least recently used (or expired)
+    slot. Every slot stores a pickled value of at most `value_size` bytes,
+    larger values are not cached. Each group is guarded by a POSIX byte-range
+    lock (`fcntl.lockf`) across processes, and by a lock of the object across
+    the threads of a process, which the POSIX locks do not separate.
+
+    Methods:
+    -------
+    `get(key: Any) -> Any`, `set(key: Any, value: Any, ttl: Optional[float]) -> None`:
+        Read and write entries.
+
+    `delete(key: Any) -> None`, `clear() -> None`:
+        Remove entries.
+
+    `close() -> None`:
+        Unmaps the file.
+    """
+
+    MAGIC = b"PYCACHE1"
+    HEADER = struct.Struct("<8sIII")
+    HEADER_SIZE = 64
+    # state (0 empty, 1 used), value length, key digest, expiry, last use
+    SLOT = struct.Struct("<B3xI20sdd")
+    EMPTY, USED = 0, 1
+
+    def __init__(
+        self,
+        path: str,
+        entries: int = 4096,
+        value_size: int = 1024,
+        ways: int = 8,
+    ) -> None:
+        """
+        Initializes a SharedMemoryBackend object, creating the file if it does
+        not exist. An existing file keeps the layout it was created with.
+
+        Args:
+            path (str): the shared file.
+            entries (int): the number of slots, rounded up to whole groups.
+            value_size (int): the maximum size of a pickled value in bytes.
+            ways (int): the number of slots in a group.
+        """
+        if fcntl is None:
+            raise OSError("SharedMemoryBackend needs POSIX file locks.")
+        self.path = path
+        self._lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._fd).st_size == 0:
+                groups = max(1, -(-entries // ways))
+                value_size = -(-value_size // 8) * 8
+                stride = self.SLOT.size + value_size
+                os.ftruncate(
+                    self._fd, self.HEADER_SIZE + groups * ways * stride
+                )
+                os.pwrite(
+                    self._fd,
+                    self.HEADER.pack(self.MAGIC, groups, ways, value_size),
+                    0,
+                )
+            header = os.pread(self._fd, self.HEADER.size, 0)
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        magic, self.groups, self.ways, self.value_size = self.HEADER.unpack(
+            header
+        )
+        if magic != self.MAGIC:
+            os.close(self._fd)
+            raise ValueError(f"'{path}' is not a shared cache file.")
+        self._stride = self.SLOT.size + self.value_size
+        self._map = mmap.mmap(self._fd, 0)
+
+    def _group(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:8], "little") % self.groups
+
+    def _slots(self, group: int) -> range:
+        start = self.HEADER_SIZE + group * self.ways * self._stride
+        return range(start, start + self.ways * self._stride, self._stride)
+
+    @contextmanager
+    def _locked(self, group: Optional[int] = None) -> Iterator[None]:
+        """
+        Locks one group, or the whole table if `group` is None.
+        """
+
+        start, length = (0, 0) if group is None else (group, 1)
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    def _find(self, digest: bytes, group: int) -> Optional[int]:
+        for offset in self._slots(group):
+            state, _, slot_digest, _, _ = self.SLOT.unpack_from(
+                self._map, offset
+            )
+            if state == self.USED and slot_digest == digest:
+                return offset
+        return None
+
+    def get(self, key: Any) -> Any:
+        """
+        Returns the stored value or `MISSING`.
+        """
+
+        digest = key_digest(key)
+        group = self._group(digest)
+        with self._locked(group):
+            offset = self._find(digest, group)
+            if offset is None:
+                return MISSING
+            _, length, _, expires, _ = self.SLOT.unpack_from(self._map, offset)
+            now = time.time()
+            if expires and expires <= now:
+                self._map[offset] = self.EMPTY
+                return MISSING
+            # Only the last use changes, at the end of the slot header
+            struct.pack_into("<d", self._map, offset + self.SLOT.size - 8, now)
+            start = offset + self.SLOT.size
+            data = self._map[start : start + length]
+        return pickle.loads(data)
+
+    def set(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores the value in the slot of the key, an empty or expired slot, or
+        the least recently used slot of its group. Values larger than
+        `value_size` are not stored.
+        """
+
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.value_size:
+            return
+        digest = key_digest(key)
+        group = self._group(digest)
+        now = time.time()
+        with self._locked(group):
+            target = self._find(digest, group)
+            if target is None:
+                oldest = None
+                for offset in self._slots(group):
+                    state, _, _, expires, used = self.SLOT.unpack_from(
+                        self._map, offset
+                    )
+                    if state == self.EMPTY or (expires and expires <= now):
+                        target = offset
+                        break
+                    if oldest is None or used < oldest:
+                        oldest, target = used, offset
+            assert target is not None
+            # Invalidate the slot while it is rewritten
+            self._map[target] = self.EMPTY
+            start = target + self.SLOT.size
+            self._map[start : start + len(data)] = data
+            self.SLOT.pack_into(
+                self._map,
+                target,
+                self.USED,
+                len(data),
+                digest,
+                0.0 if ttl is None else now + ttl,
+                now,
+            )
+
+    def delete(self, key: Any) -> None:
+        """
+        Removes the key if it is stored.
+        """
+
+        digest = key_digest(key)
+        group = self._group(digest)
+        with self._locked(group):
+            offset = self._find(digest, group)
+            if offset is not None:
+                self._map[offset] = self.EMPTY
+
+    def clear(self) -> None:
+        """
+        Removes all entries.
+        """
+
+        with self._locked():
+            for group in range(self.groups):
+                for offset in self._slots(group):
+                    self._map[offset] = self.EMPTY
+
+    def __len__(self) -> int:
+        now = time.time()
+        count = 0
+        with self._locked():
+            for group in range(self.groups):
+                for offset in self._slots(group):
+                    state, _, _, expires, _ = self.SLOT.unpack_from(
+                        self._map, offset
+                    )
+                    count += state == self.USED and not 0 < expires <= now
+        return count
+
+    def close(self) -> None:
+        """
+        Unmaps the file.
+        """
+
+        self._map.close()
+        os.close(self._fd)
@@ -1,80 +1,932 @@
-from functools import wraps
-from typing import Callable, Any, Dict
-import inspect, copy
+import asyncio
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from functools import partial, wraps
+from time import monotonic, perf_counter
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+from threading import Event, Lock, RLock
+import inspect, copy, sys, weakref
+
+if TYPE_CHECKING:
+    from project.cache_backends import CacheBackend
+    from project.thread_pool import ThreadPool
+
+MISSING = object()
+
+
+class KeywordsMark:
+    """
+    Separates the keyword arguments in cache keys. The class itself is the
+    marker, so that keys keep their meaning when pickled by cache backends.
+    """
+
+
+KWARGS_MARK = (KeywordsMark,)
+FAST_TYPES = {int, str, float, bool, bytes, type(None)}
 
 
-def make_key(args: Any, kwargs: Any) -> tuple[Any, ...]:
+def recursive_convert(item: Any, typed: bool = False) -> Any:
+    """
+    Recursively converts mutable structures (like dicts, lists, sets)
+    into immutable tuples and frozensets to make them hashable for cache
+    keys. With `typed` the converted containers are tagged by their type.
+
+    Args:
+        item: The item to be converted, which can be a dict, list, set, tuple, or any other object.
+        typed: Whether to tag the converted containers by their type.
+
+    Returns:
+        An immutable version of the input.
+    """
+
+    if isinstance(item, dict):
+        result: Any = frozenset(
+            (k, recursive_convert(v, typed)) for k, v in item.items()
+        )
+    elif isinstance(item, (set, frozenset)):
+        result = frozenset(item)
+    elif isinstance(item, (list, tuple)):
+        result = tuple(recursive_convert(i, typed) for i in item)
+    else:
+        return item
+    return (type(item), result) if typed else result
+
+
+def make_key(args: Any, kwargs: Any, typed: bool = False) -> tuple[Any, ...]:
     """
     Generates a hashable cache key from the arguments passed to the function.
-    Handles nested structures like dicts, lists, sets, and tuples by recursively
-    converting them into sorted, immutable tuples.
+    Arguments that are already hashable are used as they are, without copying.
+    Otherwise nested structures like dicts, lists, sets, and tuples are
+    converted recursively: lists and tuples into tuples, dicts and sets into
+    frozensets, so keys of dicts do not have to be comparable.
 
     Args:
         args: Positional arguments of the function.
         kwargs: Keyword arguments of the function.
+        typed: Whether arguments of different types are cached separately,
+            e.g. `f(1)` and `f(1.0)`, or `f([1])` and `f((1,))`.
 
     Returns:
         A tuple that can be used as a unique key for the function call.
     """
 
-    def recursive_convert(item: Any) -> Any:
+    if len(args) == 1 and not kwargs and not typed:
+        if type(args[0]) in FAST_TYPES:
+            return args
+    key = args
+    if kwargs:
+        key += KWARGS_MARK + tuple(sorted(kwargs.items()))
+    if typed:
+        key += tuple(type(value) for value in args)
+        key += tuple(type(kwargs[name]) for name in sorted(kwargs))
+    try:
+        hash(key)
+    except TypeError:
+        return tuple(recursive_convert(part, typed) for part in key)
+    return key
+
+
+class CacheInfo(NamedTuple):
+    """
+    Statistics of a cached function, like `functools.lru_cache().cache_info()`.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class CacheStats(NamedTuple):
+    """
+    Detailed statistics of a cached function. `time_saved` sums the cost of
+    the hit entries, measured when they were computed. `ghost_hits` counts
+    misses of keys evicted among the last `cache_size` evictions, which a
+    cache twice as large would have served: many of them mean the cache is
+    too small, while a `peak_size` below `maxsize` means it could be smaller.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+    peak_size: int
+    hit_rate: float
+    miss_time: float
+    mean_miss_latency: float
+    time_saved: float
+    ghost_hits: int
+
+
+CACHED_FUNCTIONS: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+def cache_report(top: Optional[int] = None) -> str:
+    """
+    Ranks the functions decorated by `cache_decorator` by the time their
+    caches saved.
+
+    Args:
+        top (Optional[int]): the number of functions to show, all if None.
+
+    Returns:
+        result (str): a table with one row per function.
+    """
+
+    rows = sorted(
+        (
+            (function.cache_stats(), function.__qualname__)
+            for function in list(CACHED_FUNCTIONS)
+        ),
+        key=lambda row: row[0].time_saved,
+        reverse=True,
+    )[:top]
+    lines = [
+        f"{'function':<32}{'saved, s':>10}{'hit rate':>10}{'hits':>8}"
+        f"{'misses':>8}{'miss, ms':>10}{'evicted':>8}{'ghosts':>8}"
+        f"{'size':>12}"
+    ]
+    for stats, name in rows:
+        lines.append(
+            f"{name[-31:]:<32}{stats.time_saved:>10.3f}{stats.hit_rate:>10.1%}"
+            f"{stats.hits:>8}{stats.misses:>8}"
+            f"{stats.mean_miss_latency * 1e3:>10.3f}{stats.evictions:>8}"
+            f"{stats.ghost_hits:>8}"
+            f"{f'{stats.peak_size}/{stats.maxsize or None}':>12}"
+        )
+    return "\n".join(lines)
+
+
+class CachePolicy(MutableMapping):  # type: ignore[type-arg]
+    """
+    Base class of the eviction policies of `cache_decorator`. The mapping
+    methods read and write entries without touching the bookkeeping (so
+    `dict(policy)` or `len(policy)` do not count as uses), while `lookup` and
+    `store` are the cache operations. All of them are O(1).
+
+    Methods:
+    -------
+    `lookup(key: Any) -> Any`:
+        Returns the cached value and records the use, or `MISSING`.
+
+    `store(key: Any, value: Any) -> List[Tuple[Any, Any]]`:
+        Adds an entry and returns the entries evicted to make room for it.
+
+    `evict() -> Tuple[Any, Any]`:
+        Removes and returns the entry the policy would drop next.
+    """
+
+    def __init__(self, maxsize: int) -> None:
         """
-        Recursively converts mutable structures (like dicts, lists, sets)
-        into immutable tuples to make them hashable for cache keys.
+        Initializes a policy.
 
         Args:
-            item: The item to be converted, which can be a dict, list, set, tuple, or any other object.
-
-        Returns:
-            An immutable version of the input.
+            maxsize (int): the maximum number of entries, 0 for no limit.
         """
+        self.maxsize = maxsize
+        self._data: Dict[Any, Any] = {}
 
-        if isinstance(item, dict):
-            return tuple(
-                (k, recursive_convert(v)) for k, v in sorted(item.items())
-            )
-        elif isinstance(item, (list, set, tuple)):
-            return tuple(recursive_convert(i) for i in item)
+    def __getitem__(self, key: Any) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._data[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self._data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._data
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def lookup(self, key: Any) -> Any:
+        return self._data.get(key, MISSING)
+
+    def store(self, key: Any, value: Any) -> List[Tuple[Any, Any]]:
+        evicted = []
+        if key not in self:
+            while self.maxsize and self and len(self) >= self.maxsize:
+                evicted.append(self.evict())
+        self[key] = value
+        return evicted
+
+    def evict(self) -> Tuple[Any, Any]:
+        key = next(iter(self))
+        return key, self.pop(key)
+
+
+class FIFOPolicy(CachePolicy):
+    """
+    Evicts the oldest entry, no matter how often it is used.
+    """
+
+
+class LRUPolicy(CachePolicy):
+    """
+    Evicts the least recently used entry.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+
+    def lookup(self, key: Any) -> Any:
+        value = self._data.get(key, MISSING)
+        if value is not MISSING:
+            self._data.move_to_end(key)
+        return value
+
+
+class LFUPolicy(CachePolicy):
+    """
+    Evicts the least frequently used entry, and the least recently used one
+    among entries with the same count. Keys are kept in one ordered bucket per
+    use count, so that the victim is always in the bucket `_min_count`.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+        self._counts: Dict[Any, int] = {}
+        self._buckets: Dict[int, "OrderedDict[Any, None]"] = {}
+        self._min_count = 0
+
+    def _bucket(self, count: int) -> "OrderedDict[Any, None]":
+        bucket = self._buckets.get(count)
+        if bucket is None:
+            bucket = self._buckets[count] = OrderedDict()
+        return bucket
+
+    def _unlink(self, key: Any) -> int:
+        count = self._counts.pop(key)
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+        return count
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key not in self._data:
+            self._counts[key] = 1
+            self._bucket(1)[key] = None
+            self._min_count = 1
+        self._data[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        del self._data[key]
+        self._unlink(key)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._counts.clear()
+        self._buckets.clear()
+        self._min_count = 0
+
+    def lookup(self, key: Any) -> Any:
+        value = self._data.get(key, MISSING)
+        if value is not MISSING:
+            count = self._unlink(key)
+            if count == self._min_count and count not in self._buckets:
+                self._min_count = count + 1
+            self._counts[key] = count + 1
+            self._bucket(count + 1)[key] = None
+        return value
+
+    def evict(self) -> Tuple[Any, Any]:
+        if self._min_count not in self._buckets:
+            self._min_count = min(self._buckets)
+        key = next(iter(self._buckets[self._min_count]))
+        return key, self.pop(key)
+
+
+class ARCPolicy(CachePolicy):
+    """
+    Adaptive Replacement Cache (N. Megiddo, D. Modha). Entries used once live
+    in `_recent` and entries used again in `_frequent`. The keys of evicted
+    entries are remembered in the ghost lists, and a miss on a ghost key moves
+    the target size `_target` of `_recent`, so the cache adapts between
+    recency and frequency without a parameter.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        super().__init__(maxsize)
+        self._recent: "OrderedDict[Any, Any]" = OrderedDict()
+        self._frequent: "OrderedDict[Any, Any]" = OrderedDict()
+        self._recent_ghosts: "OrderedDict[Any, None]" = OrderedDict()
+        self._frequent_ghosts: "OrderedDict[Any, None]" = OrderedDict()
+        self._target = 0.0
+
+    def __getitem__(self, key: Any) -> Any:
+        if key in self._recent:
+            return self._recent[key]
+        return self._frequent[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        if key in self._frequent:
+            self._frequent[key] = value
+        else:
+            self._recent[key] = value
+
+    def __delitem__(self, key: Any) -> None:
+        if key in self._recent:
+            del self._recent[key]
+        else:
+            del self._frequent[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        yield from self._recent
+        yield from self._frequent
+
+    def __len__(self) -> int:
+        return len(self._recent) + len(self._frequent)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._recent or key in self._frequent
+
+    def clear(self) -> None:
+        for part in (
+            self._recent,
+            self._frequent,
+            self._recent_ghosts,
+            self._frequent_ghosts,
+        ):
+            part.clear()
+        self._target = 0.0
+
+    def lookup(self, key: Any) -> Any:
+        value = self._recent.pop(key, MISSING)
+        if value is not MISSING:
+            self._frequent[key] = value
+            return value
+        value = self._frequent.get(key, MISSING)
+        if value is not MISSING:
+            self._frequent.move_to_end(key)
+        return value
+
+    def _replace(self, in_frequent_ghosts: bool) -> Tuple[Any, Any]:
+        if self._recent and (
+            not self._frequent
+            or len(self._recent) > self._target
+            or (in_frequent_ghosts and len(self._recent) == self._target)
+        ):
+            key, value = self._recent.popitem(last=False)
+            self._recent_ghosts[key] = None
         else:
-            return item
+            key, value = self._frequent.popitem(last=False)
+            self._frequent_ghosts[key] = None
+        return key, value
+
+    def store(self, key: Any, value: Any) -> List[Tuple[Any, Any]]:
+        if key in self:
+            self[key] = value
+            return []
+        evicted = []
+        size = self.maxsize
+        if key in self._recent_ghosts:
+            ratio = len(self._frequent_ghosts) / len(self._recent_ghosts)
+            self._target = min(size, self._target + max(ratio, 1))
+            del self._recent_ghosts[key]
+            if len(self) >= size:
+                evicted.append(self._replace(False))
+            self._frequent[key] = value
+            return evicted
+        if key in self._frequent_ghosts:
+            ratio = len(self._recent_ghosts) / len(self._frequent_ghosts)
+            self._target = max(0, self._target - max(ratio, 1))
+            del self._frequent_ghosts[key]
+            if len(self) >= size:
+                evicted.append(self._replace(True))
+            self._frequent[key] = value
+            return evicted
+
+        if len(self._recent) + len(self._recent_ghosts) >= size:
+            if len(self._recent) < size:
+                self._recent_ghosts.popitem(last=False)
+                if len(self) >= size:
+                    evicted.append(self._replace(False))
+            else:
+                evicted.append(self._recent.popitem(last=False))
+        else:
+            total = len(self) + len(self._recent_ghosts)
+            total += len(self._frequent_ghosts)
+            if total >= 2 * size and self._frequent_ghosts:
+                self._frequent_ghosts.popitem(last=False)
+            if len(self) >= size:
+                evicted.append(self._replace(False))
+        self._recent[key] = value
+        return evicted
+
+    def evict(self) -> Tuple[Any, Any]:
+        return self._replace(False)
+
+
+POLICIES = {
+    "fifo": FIFOPolicy,
+    "lru": LRUPolicy,
+    "lfu": LFUPolicy,
+    "arc": ARCPolicy,
+}
+
+
+LOCK_SHARDS = 16
+
+
+class Flight:
+    """
+    A call of a cached function in progress, awaited by concurrent callers
+    of the same key.
+    """
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+    def wait(self) -> Any:
+        """
+        Waits for the call and returns its result or raises its exception.
+        """
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class FlightShard:
+    """
+    The calls in progress of the keys whose hash falls into one shard, with
+    the lock of the shard, so that misses of unrelated keys rarely contend.
+    """
+
+    def __init__(self) -> None:
+        self.lock = Lock()
+        self.flights: Dict[Any, Flight] = {}
 
-    conv_args: tuple[Any, ...] = recursive_convert(args)
-    conv_kwargs: tuple[Any, ...] = recursive_convert(kwargs)
 
-    return conv_args + conv_kwargs
+def estimate_size(value: Any) -> int:
+    """
+    Estimates the memory used by a value in bytes: `sys.getsizeof` of the
+    value and, recursively, of the items of containers and the attributes of
+    objects. Buffers (ndarray, array, memoryview) count their data with
+    `nbytes`, and objects shared by several items are counted once.
+
+    Args:
+        value (Any): the value to measure.
+
+    Returns:
+        result (int): the estimated size in bytes.
+    """
+
+    seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        nbytes = getattr(item, "nbytes", None)
+        if isinstance(nbytes, int) and not isinstance(item, memoryview):
+            total += nbytes
+            continue
+        if isinstance(item, (str, bytes, bytearray, int, float, memoryview)):
+            continue
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif hasattr(item, "__dict__"):
+            stack.extend(vars(item).values())
+    return total
 
 
 def cache_decorator(
-    function: Any = None, *, cache_size: int = 0
+    function: Any = None,
+    *,
+    cache_size: int = 0,
+    policy: str = "fifo",
+    ttl: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+    sizeof: Callable[[Any], int] = estimate_size,
+    typed: bool = False,
+    key: Optional[Callable[..., Any]] = None,
+    thread_safe: bool = False,
+    backend: Optional["CacheBackend"] = None,
+    metrics: Optional[Callable[[str, Any, float], None]] = None,
 ) -> Callable[..., Any]:
     """
     Function Caching decorator.
 
     Args:
         function (Callable[..., Any]: the function to implement caching for.
-        cache_size (int): the number of recent results for the cache.
+        cache_size (int): the number of recent results for the cache, 0 for no
+            limit when `ttl` or `max_bytes` is given (otherwise 0 disables it).
+        policy (str): the eviction policy, "fifo", "lru", "lfu" or "arc".
+        ttl (Optional[float]): the number of seconds a result stays valid.
+            Expired entries are dropped when they are looked up and, on every
+            miss, from the front of the expiry queue.
+        max_bytes (Optional[int]): the budget of the summed `sizeof` of the
+            results. Entries are evicted by the policy until a new result
+            fits, and results larger than the budget are not cached.
+        sizeof (Callable[[Any], int]): the size estimator for `max_bytes`.
+        typed (bool): cache arguments of different types separately.
+        key (Optional[Callable[..., Any]]): a function called with the
+            arguments that returns the hashable cache key, instead of
+            `make_key`.
+        thread_safe (bool): guard the cache with locks for concurrent
+            callers. Concurrent misses of the same key wait for one call of
+            the function (single-flight) and share its result or exception.
+            Coroutine functions are always single-flight within their event
+            loop: the results are cached, not the coroutines, concurrent
+            awaiters of a key share one task, and exceptions are not cached.
+        backend (Optional[CacheBackend]): a second, usually persistent or
+            shared tier (see `project.cache_backends`). The memory cache
+            configured by the other options stays in front of it: memory
+            misses are looked up in the backend and computed results are
+            stored in both.
+        metrics (Optional[Callable[[str, Any, float], None]]): a hook for
+            exporting metrics, called with ("hit", key, saved seconds),
+            ("miss", key, seconds of the call) or ("evict", key, 0.0). In the
+            thread-safe mode it runs under the cache lock.
 
     Returns:
-        result (Callable[..., Any]: a function that supports caching.
+        result (Callable[..., Any]: a function that supports caching. Its
+            `dict_cache` holds the entries, `cache_info()` returns the
+            statistics (evictions include expired entries) and
+            `cache_stats()` the timings, see `CacheStats`.
+
+            `cache_invalidate(*args, **kwargs)` removes the result of one
+            call and `cache_clear()` all results, from all tiers.
+            `cache_prefill(calls, pool=None, **kwargs)` warms the cache with
+            calls, optionally in parallel on a `ThreadPool` (which needs
+            `thread_safe`); for coroutine functions it returns an awaitable.
+            `cache_snapshot()` exports the memory tier and
+            `cache_restore(snapshot)` loads it, e.g. in a new process.
     """
     if function is None:
-        return lambda func: cache_decorator(func, cache_size=cache_size)
-
-    dict_cache: Dict[tuple[Any, ...], Any] = {}
+        return lambda func: cache_decorator(
+            func,
+            cache_size=cache_size,
+            policy=policy,
+            ttl=ttl,
+            max_bytes=max_bytes,
+            sizeof=sizeof,
+            typed=typed,
+            key=key,
+            thread_safe=thread_safe,
+            backend=backend,
+            metrics=metrics,
+        )
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown cache policy '{policy}'.")
+    memory = bool(cache_size) or ttl is not None or max_bytes is not None
+    enabled = memory or backend is not None
+    if memory and not cache_size and policy == "arc":
+        raise ValueError("The 'arc' policy needs a cache_size.")
+
+    key_function = key
+    dict_cache = POLICIES[policy](cache_size)
+    lookup, store = dict_cache.lookup, dict_cache.store
+    hits = misses = evictions = computed = ghost_hits = peak_size = 0
+    miss_time = time_saved = 0.0
+    # The time each entry took to compute, which a hit of it saves
+    costs: Dict[Any, float] = {}
+    cost_of = costs.get
+    # Recently evicted keys, a miss of one of them is a "ghost hit"
+    ghosts: "OrderedDict[Any, None]" = OrderedDict()
+    # Expiry times in the order of insertion, which is also the order of
+    # expiry because every entry lives for the same `ttl`.
+    expires: "OrderedDict[Any, float]" = OrderedDict()
+    sizes: Dict[Any, int] = {}
+    total_bytes = 0
+
+    def forget(key: Any) -> None:
+        nonlocal total_bytes
+        expires.pop(key, None)
+        costs.pop(key, None)
+        total_bytes -= sizes.pop(key, 0)
+
+    def evicted(key: Any) -> None:
+        """Accounts for an entry removed by the limits."""
+        nonlocal evictions
+        forget(key)
+        evictions += 1
+        ghosts[key] = None
+        while len(ghosts) > max(cache_size, peak_size, 1):
+            ghosts.popitem(last=False)
+        if metrics is not None:
+            metrics("evict", key, 0.0)
+
+    def expire(now: float) -> None:
+        while expires:
+            key = next(iter(expires))
+            if expires[key] > now:
+                break
+            dict_cache.pop(key, None)
+            evicted(key)
+
+    def cached(key: Any) -> Any:
+        """Returns the valid cached value of the key or `MISSING`."""
+        nonlocal hits, misses, ghost_hits, time_saved
+        if memory:
+            result = lookup(key)
+            if result is not MISSING:
+                if ttl is None or expires[key] > monotonic():
+                    hits += 1
+                    cost = cost_of(key, 0.0)
+                    time_saved += cost
+                    if metrics is not None:
+                        metrics("hit", key, cost)
+                    return result
+                del dict_cache[key]
+                evicted(key)
+        if backend is not None:
+            result = backend.get(key)
+            if result is not MISSING:
+                hits += 1
+                # The cost of a result computed by another process is unknown
+                cost = miss_time / computed if computed else 0.0
+                time_saved += cost
+                if memory:
+                    keep(key, result, cost)
+                if metrics is not None:
+                    metrics("hit", key, cost)
+                return result
+        misses += 1
+        if key in ghosts:
+            ghost_hits += 1
+        return MISSING
+
+    def remember(key: Any, result: Any, elapsed: float) -> None:
+        """Stores a result computed in `elapsed` seconds in all tiers."""
+        nonlocal computed, miss_time
+        computed += 1
+        miss_time += elapsed
+        if memory:
+            keep(key, result, elapsed)
+        if backend is not None:
+            backend.set(key, result, ttl)
+        if metrics is not None:
+            metrics("miss", key, elapsed)
+
+    def keep(key: Any, result: Any, cost: float) -> None:
+        """Stores a result in memory and applies the limits."""
+        nonlocal total_bytes, peak_size
+        if key in dict_cache:
+            # A recursive call has already cached the key
+            forget(key)
+        if ttl is not None:
+            now = monotonic()
+            expire(now)
+        if max_bytes is not None:
+            size = sizeof(result)
+            if size > max_bytes:
+                dict_cache.pop(key, None)
+                return
+            while dict_cache and total_bytes + size > max_bytes:
+                evicted(dict_cache.evict()[0])
+            sizes[key] = size
+            total_bytes += size
+        if ttl is not None:
+            expires[key] = now + ttl
+        for old_key, _ in store(key, result):
+            evicted(old_key)
+        costs[key] = cost
+        ghosts.pop(key, None)
+        peak_size = max(peak_size, len(dict_cache))
+
+    def make_cache_key(args: Any, kwargs: Any) -> Any:
+        if key_function is None:
+            return make_key(args, kwargs, typed)
+        return key_function(*args, **kwargs)
 
     @wraps(function)
     def wrapper(*args: Any, **kwargs: Any) -> Any:
-        if not cache_size:
+        nonlocal misses
+        if not enabled:
+            misses += 1
             return function(*args, **kwargs)
-        key = make_key(args, kwargs)
-        if key not in dict_cache:
+        if key_function is None:
+            key = make_key(args, kwargs, typed)
+        else:
+            key = key_function(*args, **kwargs)
+        result = cached(key)
+        if result is MISSING:
+            start = perf_counter()
             result = function(*args, **kwargs)
-            if len(dict_cache) == cache_size:
-                dict_cache.pop(next(iter(dict_cache)))
-            dict_cache[key] = result
-        return dict_cache[key]
+            remember(key, result, perf_counter() - start)
+        return result
+
+    lock = RLock()
+    flight_shards = [FlightShard() for _ in range(LOCK_SHARDS)]
+
+    @wraps(function)
+    def thread_safe_wrapper(*args: Any, **kwargs: Any) -> Any:
+        nonlocal misses
+        if not enabled:
+            with lock:
+                misses += 1
+            return function(*args, **kwargs)
+        key = make_cache_key(args, kwargs)
+        with lock:
+            result = cached(key)
+        if result is not MISSING:
+            return result
+
+        shard = flight_shards[hash(key) % LOCK_SHARDS]
+        with shard.lock:
+            flight = shard.flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = shard.flights[key] = Flight()
+        if not leader:
+            return flight.wait()
+
+        try:
+            with lock:
+                # Another leader may have stored the key after our lookup
+                result = lookup(key)
+            if result is MISSING:
+                start = perf_counter()
+                result = function(*args, **kwargs)
+                elapsed = perf_counter() - start
+                with lock:
+                    remember(key, result, elapsed)
+            flight.result = result
+            return result
+        except BaseException as error:
+            flight.error = error
+            raise
+        finally:
+            with shard.lock:
+                del shard.flights[key]
+            flight.done.set()
+
+    def cache_info() -> CacheInfo:
+        return CacheInfo(hits, misses, evictions, cache_size, len(dict_cache))
+
+    def cache_stats() -> CacheStats:
+        calls = hits + misses
+        return CacheStats(
+            hits=hits,
+            misses=misses,
+            evictions=evictions,
+            maxsize=cache_size,
+            currsize=len(dict_cache),
+            peak_size=peak_size,
+            hit_rate=hits / calls if calls else 0.0,
+            miss_time=miss_time,
+            mean_miss_latency=miss_time / computed if computed else 0.0,
+            time_saved=time_saved,
+            ghost_hits=ghost_hits,
+        )
+
+    tasks: Dict[Any, "asyncio.Future[Any]"] = {}
+
+    def finish(key: Any, start: float, task: "asyncio.Future[Any]") -> None:
+        del tasks[key]
+        if not task.cancelled() and task.exception() is None:
+            remember(key, task.result(), perf_counter() - start)
 
+    @wraps(function)
+    async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+        nonlocal misses
+        if not enabled:
+            misses += 1
+            return await function(*args, **kwargs)
+        if key_function is None:
+            key = make_key(args, kwargs, typed)
+        else:
+            key = key_function(*args, **kwargs)
+        result = cached(key)
+        if result is not MISSING:
+            return result
+        task = tasks.get(key)
+        if task is None:
+            task = tasks[key] = asyncio.ensure_future(
+                function(*args, **kwargs)
+            )
+            task.add_done_callback(partial(finish, key, perf_counter()))
+        # A cancelled awaiter must not cancel the call shared with others
+        return await asyncio.shield(task)
+
+    def cache_invalidate(*args: Any, **kwargs: Any) -> bool:
+        """Removes the result of the call from all tiers."""
+        key = make_cache_key(args, kwargs)
+        with lock:
+            found = dict_cache.pop(key, MISSING) is not MISSING
+            forget(key)
+            if backend is not None:
+                backend.delete(key)
+        return found
+
+    def cache_clear() -> None:
+        """Removes all results from all tiers and resets the statistics."""
+        nonlocal hits, misses, evictions, computed, ghost_hits, peak_size
+        nonlocal miss_time, time_saved, total_bytes
+        with lock:
+            for part in (dict_cache, expires, sizes, costs, ghosts):
+                part.clear()
+            hits = misses = evictions = computed = ghost_hits = peak_size = 0
+            miss_time = time_saved = 0.0
+            total_bytes = 0
+            if backend is not None:
+                backend.clear()
+
+    def cache_prefill(
+        calls: Iterable[Any],
+        pool: Optional["ThreadPool"] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Calls the function for every item of `calls`, a tuple of positional
+        arguments or a single argument, with the shared `kwargs`.
+        """
+        arguments = [
+            call if isinstance(call, tuple) else (call,) for call in calls
+        ]
+        if is_coroutine:
+            return asyncio.gather(
+                *[wrapper(*call, **kwargs) for call in arguments]
+            )
+        if pool is None:
+            return [wrapper(*call, **kwargs) for call in arguments]
+        if not thread_safe:
+            raise ValueError("Prefilling on a ThreadPool needs thread_safe.")
+        task = partial(wrapper, **kwargs)
+        tasks = [pool.enqueue(task, *call) for call in arguments]
+        return [task.get_res() for task in tasks]
+
+    def cache_snapshot() -> List[Tuple[Any, Any, float, Optional[float]]]:
+        """
+        Returns the entries of the memory tier as (key, value, cost, seconds
+        to expiry) in the order of the policy, picklable if they are.
+        """
+        now = monotonic()
+        with lock:
+            return [
+                (
+                    key,
+                    dict_cache[key],
+                    costs.get(key, 0.0),
+                    expires[key] - now if key in expires else None,
+                )
+                for key in dict_cache
+            ]
+
+    def cache_restore(
+        snapshot: Iterable[Tuple[Any, Any, float, Optional[float]]]
+    ) -> None:
+        """
+        Stores the entries of a snapshot in the memory tier, within its
+        limits. Expired entries are skipped.
+        """
+        if not memory:
+            raise ValueError("The cache has no memory tier to restore.")
+        with lock:
+            for key, value, cost, remaining in snapshot:
+                if remaining is not None and remaining <= 0:
+                    continue
+                keep(key, value, cost)
+                if remaining is not None and key in expires:
+                    expires[key] = min(expires[key], monotonic() + remaining)
+
+    is_coroutine = inspect.iscoroutinefunction(function)
+    if is_coroutine:
+        wrapper = async_wrapper
+    elif thread_safe:
+        wrapper = thread_safe_wrapper
     setattr(wrapper, "dict_cache", dict_cache)
+    setattr(wrapper, "cache_info", cache_info)
+    setattr(wrapper, "cache_stats", cache_stats)
+    setattr(wrapper, "cache_invalidate", cache_invalidate)
+    setattr(wrapper, "cache_clear", cache_clear)
+    setattr(wrapper, "cache_prefill", cache_prefill)
+    setattr(wrapper, "cache_snapshot", cache_snapshot)
+    setattr(wrapper, "cache_restore", cache_restore)
+    CACHED_FUNCTIONS.add(wrapper)
 
     return wrapper
 
@@ -181,7 +181,7 @@ class Game:
     def _dealer_second_card(self) -> None:
         """The dealer opens the second card."""
         self._round_state = GameStates.DEALER_SECOND_CARD
-        for (id_player, player) in enumerate(self._desk.players):
+        for id_player, player in enumerate(self._desk.players):
             for id_hand, hand in enumerate(self._desk.hands[player]):
                 if not hand.in_playing:
                     continue
@@ -214,7 +214,7 @@ class Game:
         """The results of the game are summarized."""
         self._round_state = GameStates.RESULTS
         dealer_score = self._desk.dealer.hand.get_score()
-        for (id_player, player) in enumerate(self._desk.players):
+        for id_player, player in enumerate(self._desk.players):
             for id_hand, hand in enumerate(self._desk.hands[player]):
                 if not hand.in_playing:
                     continue
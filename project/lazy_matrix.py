@@ -0,0 +1,217 @@
+from array import array
+from typing import Any, List, Optional, Tuple
+
+from project.matrix_vector import HAS_NUMPY, Matrix
+
+if HAS_NUMPY:
+    import numpy as np
+
+
+class LazyMatrix:
+    """
+    A node of a lazy expression over matrices. `__add__`, `__mul__` and
+    `transpose` only build the expression tree (checking the shapes), and
+    nothing is computed until `evaluate()` or `get()`. Then the tree is rewritten:
+
+    * transposes are pushed down to the leaves, where they are zero-copy
+      stride swaps read directly by the multiplication kernel;
+    * nested sums are flattened and added in one pass into one result;
+    * nested products are flattened into chains and multiplied in the order
+      with the fewest scalar multiplications (see `Matrix.chain_multiply`).
+
+    Methods:
+    -------
+    `leaf(matrix: Matrix) -> "LazyMatrix"`:
+        Wraps a matrix into a lazy expression.
+
+    `__add__(other: Any) -> "LazyMatrix"`, `__mul__(other: Any) -> "LazyMatrix"`:
+        Build the sum or the product node.
+
+    `transpose() -> "LazyMatrix"`:
+        Builds the transpose node.
+
+    `evaluate() -> Matrix`:
+        Computes the expression.
+
+    `get() -> List[List[float]]`:
+        Computes the expression and returns its list representation.
+    """
+
+    def __init__(
+        self,
+        operation: str,
+        operands: Tuple["LazyMatrix", ...],
+        shape: Tuple[int, int],
+        matrix: Optional[Matrix] = None,
+    ) -> None:
+        """
+        Initializes a LazyMatrix node.
+
+        Args:
+            operation (str): "leaf", "add", "mul" or "transpose".
+            operands (Tuple[LazyMatrix, ...]): the child nodes.
+            shape (Tuple[int, int]): the shape of the result of the node.
+            matrix (Optional[Matrix]): the matrix of a leaf node.
+        """
+
+        self.operation = operation
+        self.operands = operands
+        self.shape = shape
+        self.matrix = matrix
+
+    @classmethod
+    def leaf(cls, matrix: Matrix) -> "LazyMatrix":
+        """
+        Wraps a matrix into a lazy expression.
+        """
+
+        return cls("leaf", (), matrix.shape, matrix)
+
+    @staticmethod
+    def _node(other: Any) -> Optional["LazyMatrix"]:
+        """
+        Converts an operand into a node, or returns None if it is not a matrix.
+        """
+
+        if isinstance(other, LazyMatrix):
+            return other
+        if isinstance(other, Matrix):
+            return LazyMatrix.leaf(other)
+        return None
+
+    def __add__(self, other: Any) -> "LazyMatrix":
+        """
+        Builds the sum node.
+        """
+
+        node = LazyMatrix._node(other)
+        if node is None:
+            return NotImplemented
+        if self.shape != node.shape:
+            raise ValueError("Matrix 'other_matrix' has wrong dimension.")
+        return LazyMatrix("add", (self, node), self.shape)
+
+    def __radd__(self, other: Any) -> "LazyMatrix":
+        """
+        Builds the sum node for `Matrix + LazyMatrix`.
+        """
+
+        node = LazyMatrix._node(other)
+        if node is None:
+            return NotImplemented
+        return node + self
+
+    def __mul__(self, other: Any) -> "LazyMatrix":
+        """
+        Builds the product node.
+        """
+
+        node = LazyMatrix._node(other)
+        if node is None:
+            return NotImplemented
+        if self.shape[1] != node.shape[0]:
+            raise ValueError(f"Matrices can't be multiplied.")
+        return LazyMatrix("mul", (self, node), (self.shape[0], node.shape[1]))
+
+    def __rmul__(self, other: Any) -> "LazyMatrix":
+        """
+        Builds the product node for `Matrix * LazyMatrix`.
+        """
+
+        node = LazyMatrix._node(other)
+        if node is None:
+            return NotImplemented
+        return node * self
+
+    def transpose(self) -> "LazyMatrix":
+        """
+        Builds the transpose node.
+        """
+
+        return LazyMatrix("transpose", (self,), (self.shape[1], self.shape[0]))
+
+    def _push_transposes(self, transposed: bool = False) -> "LazyMatrix":
+        """
+        Returns an equal tree without transpose nodes above the leaves:
+        (A + B)^T = A^T + B^T, (A B)^T = B^T A^T, (A^T)^T = A.
+        Transposed leaves become stride-swapped views of their matrices.
+        """
+
+        if self.operation == "transpose":
+            return self.operands[0]._push_transposes(not transposed)
+        if self.operation == "leaf":
+            if not transposed:
+                return self
+            assert self.matrix is not None
+            return LazyMatrix.leaf(self.matrix.transpose())
+
+        operands = [
+            operand._push_transposes(transposed) for operand in self.operands
+        ]
+        if transposed and self.operation == "mul":
+            operands.reverse()
+        shape = (self.shape[1], self.shape[0]) if transposed else self.shape
+        return LazyMatrix(self.operation, tuple(operands), shape)
+
+    def _flatten(self) -> List["LazyMatrix"]:
+        """
+        Collects the terms of a sum or the factors of a product, merging
+        nested nodes of the same operation.
+        """
+
+        terms: List[LazyMatrix] = []
+        for operand in self.operands:
+            if operand.operation == self.operation:
+                terms.extend(operand._flatten())
+            else:
+                terms.append(operand)
+        return terms
+
+    def _evaluate(self) -> Matrix:
+        """
+        Computes a tree without transpose nodes.
+        """
+
+        if self.operation == "leaf":
+            assert self.matrix is not None
+            return self.matrix
+        if self.operation == "add":
+            return LazyMatrix._fused_sum(
+                [term._evaluate() for term in self._flatten()]
+            )
+        return Matrix.chain_multiply(
+            *(factor._evaluate() for factor in self._flatten())
+        )
+
+    @staticmethod
+    def _fused_sum(terms: List[Matrix]) -> Matrix:
+        """
+        Adds all terms in one pass, allocating only the result.
+        """
+
+        backend = terms[0].backend
+        terms = [term._as_backend(backend) for term in terms]
+        if backend == "numpy":
+            result = np.add(terms[0]._data, terms[1]._data)
+            for term in terms[2:]:
+                result += term._data
+            return Matrix._wrap(result, "numpy")
+
+        data = array("d")
+        for rows in zip(*(term._rows() for term in terms)):
+            data.extend(map(sum, zip(*rows)))
+        return Matrix._wrap(data, "python", terms[0].shape)
+
+    def evaluate(self) -> Matrix:
+        """
+        Computes the expression and returns the resulting matrix.
+        """
+
+        return self._push_transposes()._evaluate()
+
+    def get(self) -> List[List[float]]:
+        """
+        Computes the expression and returns its list representation.
+        """
+
+        return self.evaluate().get()
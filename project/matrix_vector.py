@@ -1,5 +1,369 @@
+import ast
 import math
-from typing import List
+import mmap
+import os
+import sys
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from itertools import chain
+from operator import add, mul, sub
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from project.decorators import cache_decorator
+from project.thread_pool import ThreadPool
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+BACKENDS = ("python", "numpy")
+DEFAULT_BACKEND = "numpy" if HAS_NUMPY else "python"
+
+
+def resolve_backend(backend: Optional[str]) -> str:
+    """
+    Returns the name of the backend that stores the data and runs the operations.
+    `None` selects NumPy when it is importable and pure Python otherwise.
+
+    Args:
+        backend (Optional[str]): "python", "numpy" or None for automatic choice.
+
+    Returns:
+        result (str): the name of the backend.
+    """
+
+    if backend is None:
+        return DEFAULT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'.")
+    if backend == "numpy" and not HAS_NUMPY:
+        raise ImportError(
+            "The 'numpy' backend requires numpy to be installed."
+        )
+    return backend
+
+
+BLOCK_SIZE = 64
+LU_BLOCK_SIZE = 64
+STRASSEN_CROSSOVER = {
+    "python": int(os.environ.get("MATRIX_STRASSEN_CROSSOVER_PYTHON", 64)),
+    "numpy": int(os.environ.get("MATRIX_STRASSEN_CROSSOVER_NUMPY", 2048)),
+}
+
+
+def classical_product(rows: List[Any], columns: List[Any]) -> array:
+    """
+    Multiplies matrices given as the rows of the left one and the columns of
+    the right one. The columns are processed in blocks of `BLOCK_SIZE`, so
+    that a block stays hot while all rows run over it.
+
+    Args:
+        rows (List[Sequence[float]]): the rows of the left matrix.
+        columns (List[Sequence[float]]): the columns of the right matrix.
+
+    Returns:
+        result (array): the product in the row-major order.
+    """
+
+    count_columns = len(columns)
+    result = array("d", bytes(8 * len(rows) * count_columns))
+    for block_start in range(0, count_columns, BLOCK_SIZE):
+        block = columns[block_start : block_start + BLOCK_SIZE]
+        position = block_start
+        for row in rows:
+            result[position : position + len(block)] = array(
+                "d", [sum(map(mul, row, column)) for column in block]
+            )
+            position += count_columns
+    return result
+
+
+def strassen_size(size: int, crossover: int) -> int:
+    """
+    Returns the smallest padded size `leaf * 2**depth` not less than `size`
+    such that the recursion stops at leaves not larger than `crossover`.
+    """
+
+    depth = 0
+    while (size + (1 << depth) - 1) >> depth > crossover:
+        depth += 1
+    leaf = (size + (1 << depth) - 1) >> depth
+    return leaf << depth
+
+
+def _quadrants(flat: List[float], size: int) -> List[List[float]]:
+    """
+    Splits a flat square matrix into four flat quadrants (11, 12, 21, 22).
+    """
+
+    half = size // 2
+    quadrants: List[List[float]] = [[], [], [], []]
+    for row_num in range(size):
+        start = row_num * size
+        top = 0 if row_num < half else 2
+        quadrants[top].extend(flat[start : start + half])
+        quadrants[top + 1].extend(flat[start + half : start + size])
+    return quadrants
+
+
+def strassen_product(
+    left: List[float], right: List[float], size: int, crossover: int
+) -> List[float]:
+    """
+    Multiplies two flat square matrices of the given size with the Winograd
+    variant of the Strassen algorithm (7 multiplications and 15 additions per
+    level). Blocks not larger than `crossover` use the classical kernel.
+
+    Args:
+        left (List[float]): the left matrix in the row-major order.
+        right (List[float]): the right matrix in the row-major order.
+        size (int): the size of the matrices, `strassen_size` of the real size.
+        crossover (int): the size below which the classical kernel is used.
+
+    Returns:
+        result (List[float]): the product in the row-major order.
+    """
+
+    if size <= crossover or size % 2:
+        rows = [left[i : i + size] for i in range(0, size * size, size)]
+        columns = [right[j::size] for j in range(size)]
+        return classical_product(rows, columns).tolist()
+
+    half = size // 2
+    a11, a12, a21, a22 = _quadrants(left, size)
+    b11, b12, b21, b22 = _quadrants(right, size)
+
+    s1 = list(map(add, a21, a22))
+    s2 = list(map(sub, s1, a11))
+    s3 = list(map(sub, a11, a21))
+    s4 = list(map(sub, a12, s2))
+    t1 = list(map(sub, b12, b11))
+    t2 = list(map(sub, b22, t1))
+    t3 = list(map(sub, b22, b12))
+    t4 = list(map(sub, t2, b21))
+
+    p1 = strassen_product(a11, b11, half, crossover)
+    p2 = strassen_product(a12, b21, half, crossover)
+    p3 = strassen_product(s4, b22, half, crossover)
+    p4 = strassen_product(a22, t4, half, crossover)
+    p5 = strassen_product(s1, t1, half, crossover)
+    p6 = strassen_product(s2, t2, half, crossover)
+    p7 = strassen_product(s3, t3, half, crossover)
+
+    c11 = list(map(add, p1, p2))
+    u2 = list(map(add, p1, p6))
+    u3 = list(map(add, u2, p7))
+    c12 = list(map(add, map(add, u2, p5), p3))
+    c21 = list(map(sub, u3, p4))
+    c22 = list(map(add, u3, p5))
+
+    result: List[float] = []
+    for row_num in range(half):
+        start = row_num * half
+        result.extend(c11[start : start + half])
+        result.extend(c12[start : start + half])
+    for row_num in range(half):
+        start = row_num * half
+        result.extend(c21[start : start + half])
+        result.extend(c22[start : start + half])
+    return result
+
+
+def strassen_product_numpy(left: Any, right: Any, crossover: int) -> Any:
+    """
+    The same Strassen-Winograd recursion over square ndarrays of the size
+    `strassen_size(...)`. Quadrants are views and leaves are computed by BLAS.
+    """
+
+    size = left.shape[0]
+    if size <= crossover or size % 2:
+        return left @ right
+
+    half = size // 2
+    a11, a12 = left[:half, :half], left[:half, half:]
+    a21, a22 = left[half:, :half], left[half:, half:]
+    b11, b12 = right[:half, :half], right[:half, half:]
+    b21, b22 = right[half:, :half], right[half:, half:]
+
+    s1 = a21 + a22
+    s2 = s1 - a11
+    t1 = b12 - b11
+    t2 = b22 - t1
+
+    p1 = strassen_product_numpy(a11, b11, crossover)
+    p2 = strassen_product_numpy(a12, b21, crossover)
+    p3 = strassen_product_numpy(a12 - s2, b22, crossover)
+    p4 = strassen_product_numpy(a22, t2 - b21, crossover)
+    p5 = strassen_product_numpy(s1, t1, crossover)
+    p6 = strassen_product_numpy(s2, t2, crossover)
+    p7 = strassen_product_numpy(a11 - a21, b22 - b12, crossover)
+
+    result = np.empty((size, size), dtype=np.float64)
+    np.add(p1, p2, out=result[:half, :half])
+    p6 += p1
+    p7 += p6
+    p6 += p5
+    np.add(p6, p3, out=result[:half, half:])
+    np.subtract(p7, p4, out=result[half:, :half])
+    np.add(p7, p5, out=result[half:, half:])
+    return result
+
+
+@cache_decorator(cache_size=256)
+def chain_order(dims: List[int]) -> Tuple[int, Any]:
+    """
+    Finds the cheapest order to multiply a chain of matrices with dynamic
+    programming over all parenthesizations in O(n^3). The plans are cached
+    by the shape signature, so repeated chains of the same shapes are free.
+
+    Args:
+        dims (List[int]): the i-th matrix of the chain has the shape
+            (dims[i], dims[i + 1]).
+
+    Returns:
+        result (Tuple[int, Any]): the number of scalar multiplications and
+            the plan: the index of a matrix or a pair of plans to multiply.
+    """
+
+    count = len(dims) - 1
+    cost = [[0] * count for _ in range(count)]
+    split = [[0] * count for _ in range(count)]
+    for length in range(2, count + 1):
+        for i in range(count - length + 1):
+            j = i + length - 1
+            cost[i][j] = -1
+            for k in range(i, j):
+                candidate = (
+                    cost[i][k]
+                    + cost[k + 1][j]
+                    + dims[i] * dims[k + 1] * dims[j + 1]
+                )
+                if cost[i][j] < 0 or candidate < cost[i][j]:
+                    cost[i][j] = candidate
+                    split[i][j] = k
+
+    def build(i: int, j: int) -> Any:
+        if i == j:
+            return i
+        return (build(i, split[i][j]), build(split[i][j] + 1, j))
+
+    return cost[0][count - 1], build(0, count - 1)
+
+
+def _norm_numpy(data: Any) -> float:
+    """
+    Returns the Euclidean norm of a 1D ndarray, rescaling by the largest
+    magnitude when the sum of squares overflows or underflows.
+    """
+
+    with np.errstate(over="ignore", under="ignore"):
+        norm = math.sqrt(float(np.dot(data, data)))
+    if norm == 0 or math.isinf(norm):
+        scale = float(np.max(np.abs(data)))
+        if scale == 0 or math.isinf(scale):
+            return scale
+        scaled = data / scale
+        norm = scale * math.sqrt(float(np.dot(scaled, scaled)))
+    return norm
+
+
+NPY_MAGIC = b"\x93NUMPY"
+
+
+def write_npy(path: str, shape: Tuple[int, ...], data: Any) -> None:
+    """
+    Writes float64 data in the row-major order to a `.npy` file (format 1.0),
+    which can be read by `numpy.load`.
+
+    Args:
+        path (str): the path of the file.
+        shape (Tuple[int, ...]): the shape of the array.
+        data (Any): a contiguous buffer of little-endian doubles.
+    """
+
+    header = (
+        f"{{'descr': '<f8', 'fortran_order': False, 'shape': {tuple(shape)}, }}"
+    ).encode("latin1")
+    padding = 64 - (len(NPY_MAGIC) + 4 + len(header) + 1) % 64
+    header += b" " * padding + b"\n"
+    with open(path, "wb") as file:
+        file.write(NPY_MAGIC + bytes([1, 0]))
+        file.write(len(header).to_bytes(2, "little"))
+        file.write(header)
+        file.write(data)
+
+
+def read_npy(
+    path: str, mmap_mode: bool = False
+) -> Tuple[Tuple[int, ...], bool, Any]:
+    """
+    Reads a `.npy` file with little-endian float64 data.
+
+    Args:
+        path (str): the path of the file.
+        mmap_mode (bool): map the data read-only instead of reading it.
+
+    Returns:
+        result (Tuple[Tuple[int, ...], bool, Any]): the shape, whether the data is
+            in the column-major (Fortran) order, and the data as an `array('d')`
+            or a read-only memoryview of the mapped file.
+    """
+
+    with open(path, "rb") as file:
+        if file.read(len(NPY_MAGIC)) != NPY_MAGIC:
+            raise ValueError(f"'{path}' is not a .npy file.")
+        major = file.read(2)[0]
+        length_size = 2 if major == 1 else 4
+        header_length = int.from_bytes(file.read(length_size), "little")
+        header = ast.literal_eval(file.read(header_length).decode("latin1"))
+        if header["descr"] not in ("<f8", "=f8") or sys.byteorder != "little":
+            raise ValueError(
+                "Only little-endian float64 .npy files are supported."
+            )
+        shape = tuple(header["shape"])
+        offset = len(NPY_MAGIC) + 2 + length_size + header_length
+        count = math.prod(shape)
+
+        data: Any
+        if mmap_mode:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            data = memoryview(mapped)[offset : offset + 8 * count].cast("d")
+        else:
+            data = array("d")
+            data.frombytes(file.read(8 * count))
+        if len(data) != count:
+            raise ValueError(f"'{path}' is truncated.")
+    return shape, header["fortran_order"], data
+
+
+_worker_right: Any = None
+
+
+def _set_worker_right(right: Any) -> None:
+    """
+    Initializer of the worker processes: keeps the right operand of a parallel
+    product, so that it is sent once per process and not once per block.
+    """
+
+    global _worker_right
+    _worker_right = right
+
+
+def _block_product(left: Any, right: Any = None) -> Any:
+    """
+    Computes one row block of a parallel product. `left` is a list of rows
+    (python backend) or a 2D ndarray, `right` is a list of columns or an ndarray,
+    and is taken from the worker initializer when omitted.
+    """
+
+    if right is None:
+        right = _worker_right
+    if isinstance(left, list):
+        return classical_product(left, right)
+    return left @ right
 
 
 class Matrix:
@@ -7,103 +371,1149 @@ class Matrix:
     A class to represent a mathematical matrix and perform operations such as
     addition, multiplication, and transposition.
 
+    The data is stored by one of the backends: "python" keeps a single flat
+    `array('d')` in row-major order together with shape/stride metadata and
+    runs the operations with plain loops, "numpy" keeps a float64 ndarray and
+    dispatches the operations to vectorized/BLAS routines. In both backends
+    transposition and slicing return views that share the data.
+
     Methods:
     -------
     `transpose() -> "Matrix"`:
-        Returns the transpose of the matrix.
+        Returns the transpose of the matrix (a view without copying).
 
     `__add__(other_matrix: "Matrix") -> "Matrix"`:
         Performs matrix addition and returns a new matrix.
 
-    `__mul__(other_matrix: "Matrix") -> "Matrix"`:
-        Performs matrix multiplication and returns a new matrix.
+    `__iadd__(other_matrix: "Matrix") -> "Matrix"`, `__imul__(alpha: float) -> "Matrix"`:
+        Add a matrix or multiply by a number in place.
+
+    `add(other_matrix: "Matrix", out: "Matrix") -> "Matrix"`, `scale(alpha: float, out: "Matrix") -> "Matrix"`:
+        Perform addition or multiplication by a number, writing into `out`.
+
+    `axpy(alpha: float, other_matrix: "Matrix") -> "Matrix"`:
+        Adds a scaled matrix in place.
+
+    `gemm(alpha, a, b, beta, c) -> "Matrix"`:
+        Static method to compute `C = alpha * A * B + beta * C` in place.
+
+    `__mul__(other_matrix: "Matrix") -> "Matrix"`:
+        Performs matrix multiplication and returns a new matrix.
+
+    `chain_multiply(*matrices: "Matrix") -> "Matrix"`:
+        Static method to multiply a chain of matrices in the cheapest order.
+
+    `chain_report(*matrices: "Matrix") -> Dict[str, Any]`:
+        Static method to compare the predicted flops with the left-to-right order.
+
+    `lu(block_size: Optional[int]) -> LUDecomposition`:
+        Returns the LU decomposition with partial pivoting, cached until a change.
+
+    `solve(b: Any) -> Any`, `det() -> float`, `inverse() -> "Matrix"`:
+        Solve linear systems, compute the determinant and the inverse through `lu()`.
+
+    `identity(size: int, backend: Optional[str]) -> "Matrix"`:
+        Static method to create the identity matrix.
+
+    `power(k: int, modulo: Optional[int]) -> "Matrix"`, `__pow__`:
+        Raise a square matrix to the integer power by repeated squaring.
+
+    `lazy() -> LazyMatrix`:
+        Starts a lazy expression that is evaluated on `get()` or `evaluate()`.
+
+    `matvec(vector: "Vector") -> "Vector"`, `vecmat(vector: "Vector") -> "Vector"`:
+        Multiply the matrix by a column vector or a row vector by the matrix.
+
+    `matmul(other_matrix: "Matrix", workers: int, executor: Any) -> "Matrix"`:
+        Performs matrix multiplication on several threads or processes.
+
+    `__getitem__(key: Any) -> Any`:
+        Returns an element or a view of the selected rows and columns.
+
+    `__setitem__(key: Tuple[int, int], value: float) -> None`:
+        Sets an element of the matrix.
+
+    `row(i: int) -> "Matrix"`, `column(j: int) -> "Matrix"`:
+        Return the row (1xN) or the column (Nx1) view.
+
+    `copy() -> "Matrix"`:
+        Returns a contiguous copy of the matrix.
+
+    `from_buffer(buffer: Any, shape: Tuple[int, int]) -> "Matrix"`, `to_bytes() -> bytes`:
+        Create a matrix over a buffer of doubles without copying, or export the data.
+
+    `save(path: str)`, `load(path: str, mmap: bool) -> "Matrix"`:
+        Save to or load from a `.npy` file, optionally memory-mapped read-only.
+
+    `to_memoryview() -> memoryview`, `__buffer__`, `__array__`:
+        Expose the data to memoryview and NumPy without copying.
+
+    `is_matrix(list_of_lists: List[List[float]]) -> bool`:
+        Static method to check if a 2D list is a valid matrix.
+
+    `get() -> List[List[float]]`:
+        Returns a list representation of the matrix.
+    """
+
+    def __init__(
+        self,
+        matrix: Any,
+        backend: Optional[str] = None,
+        assume_valid: bool = False,
+    ):
+        """
+        Initializes a Matrix object.
+
+        Args:
+            matrix (List[List[float]]): a 2D list (or a 2D ndarray) with the data.
+            backend (Optional[str]): "python", "numpy" or None to pick NumPy
+                automatically when it is importable.
+            assume_valid (bool): skip the `is_matrix` check of every row, for
+                input that is known to be a non-empty list of equal-length rows.
+        """
+
+        self.backend = resolve_backend(backend)
+        self._version = [0]
+        self._lu_cache: Optional[Tuple[int, LUDecomposition]] = None
+        if HAS_NUMPY and isinstance(matrix, np.ndarray):
+            if matrix.ndim != 2 or matrix.size == 0:
+                raise TypeError("Input must be a valid matrix.")
+            shape = (matrix.shape[0], matrix.shape[1])
+        elif assume_valid or Matrix.is_matrix(matrix):
+            shape = (len(matrix), len(matrix[0]))
+        else:
+            raise TypeError("Input must be a valid matrix.")
+
+        self._data: Any
+        if self.backend == "numpy":
+            self._data = np.ascontiguousarray(matrix, dtype=np.float64)
+            return
+
+        if HAS_NUMPY and isinstance(matrix, np.ndarray):
+            self._data = array("d")
+            self._data.frombytes(
+                np.ascontiguousarray(matrix, dtype=np.float64).tobytes()
+            )
+        else:
+            self._data = array("d", chain.from_iterable(matrix))
+        self._shape = shape
+        self._strides = (shape[1], 1)
+        self._offset = 0
+
+    @classmethod
+    def _wrap(
+        cls,
+        data: Any,
+        backend: str,
+        shape: Tuple[int, int] = (0, 0),
+        strides: Optional[Tuple[int, int]] = None,
+        offset: int = 0,
+        version: Optional[List[int]] = None,
+    ) -> "Matrix":
+        """
+        Creates a matrix over existing storage without validating or copying it.
+        For the "python" backend `data` is a flat array of doubles described by
+        `shape`, `strides` (in elements) and `offset`, for "numpy" it is a 2D ndarray.
+        Views pass the `version` counter of their base, so that a change made
+        through any of them invalidates the cached results of all of them.
+        """
+
+        result = cls.__new__(cls)
+        result.backend = backend
+        result._data = data
+        result._version = version if version is not None else [0]
+        result._lu_cache = None
+        if backend == "python":
+            result._shape = shape
+            result._strides = strides if strides is not None else (shape[1], 1)
+            result._offset = offset
+        return result
+
+    @property
+    def matrix(self) -> List[List[float]]:
+        """
+        The list representation of the matrix.
+        """
+
+        return self.get()
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """
+        The number of rows and columns of the matrix.
+        """
+
+        if self.backend == "numpy":
+            return (self._data.shape[0], self._data.shape[1])
+        return self._shape
+
+    @property
+    def strides(self) -> Tuple[int, int]:
+        """
+        The distance (in elements) between neighbouring rows and columns.
+        """
+
+        if self.backend == "numpy":
+            itemsize = self._data.itemsize
+            return (
+                self._data.strides[0] // itemsize,
+                self._data.strides[1] // itemsize,
+            )
+        return self._strides
+
+    def _as_backend(self, backend: str) -> "Matrix":
+        """
+        Returns the matrix stored by the given backend, copying only if it differs.
+        """
+
+        if self.backend == backend:
+            return self
+        if backend == "numpy":
+            return Matrix._wrap(
+                np.array(self.get(), dtype=np.float64), "numpy"
+            )
+        return Matrix(self._data, backend="python")
+
+    def _rows(self) -> Iterator[Any]:
+        """
+        Yields the rows of the "python" storage as flat sequences of doubles.
+        """
+
+        count_rows, count_columns = self._shape
+        row_stride, column_stride = self._strides
+        span = (count_columns - 1) * column_stride + 1
+        for row_num in range(count_rows):
+            start = self._offset + row_num * row_stride
+            yield self._data[start : start + span : column_stride]
+
+    def _touch(self) -> None:
+        """
+        Marks the storage as changed, invalidating the cached LU decomposition
+        of the matrix and of all views of the same storage.
+        """
+
+        self._version[0] += 1
+
+    def _check_out(self, out: "Matrix", shape: Tuple[int, int]) -> None:
+        """
+        Checks that `out` can receive a result of the given shape.
+        """
+
+        if out.backend != self.backend:
+            raise ValueError("Matrix 'out' must use the same backend.")
+        if out.shape != shape:
+            raise ValueError("Matrix 'out' has wrong dimension.")
+
+    def _unaliased(self, operand: "Matrix") -> "Matrix":
+        """
+        Returns the operand, copied if it shares the "python" storage with this
+        (output) matrix in a different layout, so that writing the result rows
+        cannot change elements which are still to be read.
+        """
+
+        if operand._data is self._data and (
+            operand._shape,
+            operand._strides,
+            operand._offset,
+        ) != (self._shape, self._strides, self._offset):
+            return operand.copy()
+        return operand
+
+    def _store_rows(self, rows: Iterable[array]) -> "Matrix":
+        """
+        Writes the rows into the "python" storage of the matrix in place.
+        """
+
+        self._touch()
+        row_stride, column_stride = self._strides
+        span = (self._shape[1] - 1) * column_stride + 1
+        start = self._offset
+        for row in rows:
+            self._data[start : start + span : column_stride] = row
+            start += row_stride
+        return self
+
+    def _result(
+        self,
+        rows: Iterable[array],
+        shape: Tuple[int, int],
+        out: Optional["Matrix"],
+    ) -> "Matrix":
+        """
+        Writes the rows of a "python" result into `out`, or collects them into a
+        new matrix if `out` is None.
+        """
+
+        if out is not None:
+            return out._store_rows(rows)
+        data = array("d")
+        for row in rows:
+            data.extend(row)
+        return Matrix._wrap(data, "python", shape)
+
+    def __add__(self, other_matrix: "Matrix") -> "Matrix":
+        """
+        Adds two matrices and returns a new matrix.
+        """
+
+        if not isinstance(other_matrix, Matrix):
+            return NotImplemented
+        return self.add(other_matrix)
+
+    def __iadd__(self, other_matrix: "Matrix") -> "Matrix":
+        """
+        Adds the other matrix to this one in place.
+        """
+
+        if not isinstance(other_matrix, Matrix):
+            return NotImplemented
+        return self.add(other_matrix, out=self)
+
+    def add(
+        self, other_matrix: "Matrix", out: Optional["Matrix"] = None
+    ) -> "Matrix":
+        """
+        Adds two matrices. If `out` is given (it may be one of the operands),
+        the result is written into it instead of a new matrix.
+        """
+
+        if self.shape != other_matrix.shape:
+            raise ValueError("Matrix 'other_matrix' has wrong dimension.")
+        other = other_matrix._as_backend(self.backend)
+        if out is not None:
+            self._check_out(out, self.shape)
+        if self.backend == "numpy":
+            if out is None:
+                return Matrix._wrap(self._data + other._data, "numpy")
+            out._touch()
+            np.add(self._data, other._data, out=out._data)
+            return out
+
+        left = self if out is None else out._unaliased(self)
+        right = other if out is None else out._unaliased(other)
+        return self._result(
+            (
+                array("d", map(add, row, other_row))
+                for row, other_row in zip(left._rows(), right._rows())
+            ),
+            self._shape,
+            out,
+        )
+
+    def scale(self, alpha: float, out: Optional["Matrix"] = None) -> "Matrix":
+        """
+        Multiplies the matrix by a number, writing into `out` if it is given.
+        """
+
+        if out is not None:
+            self._check_out(out, self.shape)
+        if self.backend == "numpy":
+            if out is None:
+                return Matrix._wrap(self._data * alpha, "numpy")
+            out._touch()
+            np.multiply(self._data, alpha, out=out._data)
+            return out
+
+        source = self if out is None else out._unaliased(self)
+        return self._result(
+            (
+                array("d", [alpha * value for value in row])
+                for row in source._rows()
+            ),
+            self._shape,
+            out,
+        )
+
+    def __rmul__(self, alpha: Any) -> Any:
+        """
+        Multiplies a number by the matrix.
+        """
+
+        if not isinstance(alpha, (int, float)):
+            return NotImplemented
+        return self.scale(alpha)
+
+    def __imul__(self, alpha: Any) -> Any:
+        """
+        Multiplies the matrix by a number in place. Products with matrices
+        fall back to `__mul__` and return a new matrix.
+        """
+
+        if not isinstance(alpha, (int, float)):
+            return NotImplemented
+        return self.scale(alpha, out=self)
+
+    def axpy(self, alpha: float, other_matrix: "Matrix") -> "Matrix":
+        """
+        Adds the other matrix multiplied by a number in place: `self += alpha * other`.
+        The numpy backend creates one temporary for `alpha * other`.
+        """
+
+        if self.shape != other_matrix.shape:
+            raise ValueError("Matrix 'other_matrix' has wrong dimension.")
+        other = other_matrix._as_backend(self.backend)
+        if self.backend == "numpy":
+            self._touch()
+            if alpha == 1:
+                self._data += other._data
+            else:
+                self._data += alpha * other._data
+            return self
+
+        other = self._unaliased(other)
+        return self._store_rows(
+            array("d", [value + alpha * x for value, x in zip(row, other_row)])
+            for row, other_row in zip(self._rows(), other._rows())
+        )
+
+    @staticmethod
+    def gemm(
+        alpha: float,
+        a: "Matrix",
+        b: "Matrix",
+        beta: float,
+        c: "Matrix",
+        work: Optional["Matrix"] = None,
+    ) -> "Matrix":
+        """
+        Computes `C = alpha * A * B + beta * C` in place, fusing the scaling and
+        the addition into the multiplication, and returns `C`.
+
+        Args:
+            alpha (float): the factor of the product.
+            a (Matrix): the left factor, it must not share the storage with `c`.
+            b (Matrix): the right factor, it must not share the storage with `c`.
+            beta (float): the factor of `c`; with 0 the old values of `c` are ignored.
+            c (Matrix): the accumulator, it receives the result.
+            work (Optional[Matrix]): a buffer of the shape of `c` for the product,
+                reused between calls by the numpy backend instead of a temporary.
+
+        Returns:
+            result (Matrix): the matrix `c`.
+        """
+
+        if a.shape[1] != b.shape[0]:
+            raise ValueError(f"Matrices can't be multiplied.")
+        a._check_out(c, (a.shape[0], b.shape[1]))
+        if c._data is a._data or c._data is b._data:
+            raise ValueError(
+                "Matrix 'c' must not share data with the factors."
+            )
+        b = b._as_backend(c.backend)
+
+        if c.backend == "numpy":
+            c._touch()
+            if beta == 0:
+                np.matmul(a._data, b._data, out=c._data)
+                if alpha != 1:
+                    c._data *= alpha
+                return c
+            if work is None:
+                product = a._data @ b._data
+            else:
+                a._check_out(work, c.shape)
+                product = np.matmul(a._data, b._data, out=work._data)
+            if alpha != 1:
+                product *= alpha
+            if beta != 1:
+                c._data *= beta
+            c._data += product
+            return c
+
+        columns = list(b.transpose()._rows())
+        if beta == 0:
+            rows = (
+                array(
+                    "d",
+                    [alpha * sum(map(mul, row, column)) for column in columns],
+                )
+                for row in a._rows()
+            )
+        else:
+            rows = (
+                array(
+                    "d",
+                    [
+                        alpha * sum(map(mul, row, column)) + beta * value
+                        for column, value in zip(columns, c_row)
+                    ],
+                )
+                for row, c_row in zip(a._rows(), c._rows())
+            )
+        return c._store_rows(rows)
+
+    def transpose(self) -> "Matrix":
+        """
+        Transposes the matrix (flips rows and columns).
+        The result is a view that shares the data with the original matrix.
+        """
+
+        if self.backend == "numpy":
+            return Matrix._wrap(self._data.T, "numpy", version=self._version)
+
+        count_rows, count_columns = self._shape
+        row_stride, column_stride = self._strides
+        return Matrix._wrap(
+            self._data,
+            "python",
+            (count_columns, count_rows),
+            (column_stride, row_stride),
+            self._offset,
+            self._version,
+        )
+
+    def __mul__(self, other_matrix: Any) -> Any:
+        """
+        Multiplies two matrices and returns a new matrix.
+        A `Vector` operand is multiplied with `matvec` and gives a new vector,
+        a number operand scales the matrix.
+        """
+
+        if isinstance(other_matrix, Vector):
+            return self.matvec(other_matrix)
+        if isinstance(other_matrix, (int, float)):
+            return self.scale(other_matrix)
+        if not isinstance(other_matrix, Matrix):
+            return NotImplemented
+        if self.shape[1] != other_matrix.shape[0]:
+            raise ValueError(f"Matrices can't be multiplied.")
+        other = other_matrix._as_backend(self.backend)
+        if self.backend == "numpy":
+            count_rows, count_inner = self._data.shape
+            count_columns = other._data.shape[1]
+            crossover = STRASSEN_CROSSOVER["numpy"]
+            if min(count_rows, count_inner, count_columns) <= crossover:
+                return Matrix._wrap(self._data @ other._data, "numpy")
+            size = strassen_size(
+                max(count_rows, count_inner, count_columns), crossover
+            )
+            left = np.zeros((size, size))
+            right = np.zeros((size, size))
+            left[:count_rows, :count_inner] = self._data
+            right[:count_inner, :count_columns] = other._data
+            product = strassen_product_numpy(left, right, crossover)
+            return Matrix._wrap(
+                product[:count_rows, :count_columns].copy(), "numpy"
+            )
+
+        count_rows, count_inner = self._shape
+        count_columns = other._shape[1]
+        crossover = STRASSEN_CROSSOVER["python"]
+        if min(count_rows, count_inner, count_columns) <= crossover:
+            multi_matrix = classical_product(
+                list(self._rows()), list(other.transpose()._rows())
+            )
+            return Matrix._wrap(
+                multi_matrix, "python", (count_rows, count_columns)
+            )
+
+        size = strassen_size(
+            max(count_rows, count_inner, count_columns), crossover
+        )
+        product = strassen_product(
+            self._padded(size), other._padded(size), size, crossover
+        )
+        multi_matrix = array("d")
+        for row_num in range(count_rows):
+            start = row_num * size
+            multi_matrix.extend(product[start : start + count_columns])
+        return Matrix._wrap(
+            multi_matrix, "python", (count_rows, count_columns)
+        )
+
+    @staticmethod
+    def _chain_dims(matrices: Tuple["Matrix", ...]) -> List[int]:
+        """
+        Returns the shape signature of a chain of matrices, checking that
+        neighbouring matrices can be multiplied.
+        """
+
+        if not matrices:
+            raise ValueError("The chain must contain at least one matrix.")
+        for left, right in zip(matrices, matrices[1:]):
+            if left.shape[1] != right.shape[0]:
+                raise ValueError(f"Matrices can't be multiplied.")
+        return [matrix.shape[0] for matrix in matrices] + [
+            matrices[-1].shape[1]
+        ]
+
+    @staticmethod
+    def chain_multiply(*matrices: "Matrix") -> "Matrix":
+        """
+        Multiplies a chain of matrices `A * B * C * ...` in the order with the
+        fewest scalar multiplications, found by `chain_order`.
+        """
+
+        def multiply(plan: Any) -> "Matrix":
+            if isinstance(plan, int):
+                return matrices[plan]
+            return multiply(plan[0]) * multiply(plan[1])
+
+        return multiply(chain_order(Matrix._chain_dims(matrices))[1])
+
+    @staticmethod
+    def chain_report(*matrices: "Matrix") -> Dict[str, Any]:
+        """
+        Compares the order chosen by `chain_multiply` with the left-to-right one.
+
+        Returns:
+            result (Dict[str, Any]): "plan" is the chosen parenthesization
+                (matrices are named by their positions), "flops" and
+                "naive_flops" are the predicted floating point operations
+                (2 per scalar multiply-add) and "speedup" is their ratio.
+        """
+
+        dims = Matrix._chain_dims(matrices)
+        multiplications, plan = chain_order(dims)
+        naive = sum(
+            dims[0] * dims[i] * dims[i + 1] for i in range(1, len(dims) - 1)
+        )
+
+        def describe(plan: Any) -> str:
+            if isinstance(plan, int):
+                return f"M{plan}"
+            return f"({describe(plan[0])} * {describe(plan[1])})"
+
+        return {
+            "plan": describe(plan),
+            "flops": 2 * multiplications,
+            "naive_flops": 2 * naive,
+            "speedup": naive / multiplications if multiplications else 1.0,
+        }
+
+    def lu(self, block_size: Optional[int] = None) -> "LUDecomposition":
+        """
+        Returns the LU decomposition with partial pivoting of a square matrix.
+        It is cached on the matrix until the matrix (or any view of its storage)
+        is changed through this class, so repeated solves cost O(n^2) each.
+        """
+
+        if self._lu_cache is None or self._lu_cache[0] != self._version[0]:
+            self._lu_cache = (
+                self._version[0],
+                LUDecomposition.factorize(self, block_size),
+            )
+        return self._lu_cache[1]
+
+    def solve(self, b: Any) -> Any:
+        """
+        Solves `A x = b` for a `Vector` or for every column of a `Matrix`.
+        """
+
+        return self.lu().solve(b)
+
+    def det(self) -> float:
+        """
+        Returns the determinant of a square matrix.
+        """
+
+        return self.lu().det()
+
+    def inverse(self) -> "Matrix":
+        """
+        Returns the inverse of a square matrix.
+        """
+
+        return self.lu().inverse()
+
+    @staticmethod
+    def identity(size: int, backend: Optional[str] = None) -> "Matrix":
+        """
+        Returns the identity matrix of the given size.
+        """
+
+        data = array("d", bytes(8 * size * size))
+        data[:: size + 1] = array("d", [1.0] * size)
+        return Matrix._wrap(data, "python", (size, size))._as_backend(
+            resolve_backend(backend)
+        )
+
+    def __pow__(self, k: int, modulo: Optional[int] = None) -> "Matrix":
+        """
+        Raises a square matrix to the integer power, see `power`.
+        Supports `pow(matrix, k, modulo)`.
+        """
+
+        return self.power(k, modulo)
+
+    def power(self, k: int, modulo: Optional[int] = None) -> "Matrix":
+        """
+        Raises a square matrix to the integer power by repeated squaring, with
+        O(log k) multiplications. The squares and the products are written into
+        a fixed set of buffers, so no matrix is allocated per step.
+
+        Args:
+            k (int): the exponent; a negative one raises the inverse matrix.
+            modulo (Optional[int]): compute the power of an integer matrix
+                modulo this number with exact integer arithmetic.
+
+        Returns:
+            result (Matrix): the power in the backend of this matrix.
+        """
+
+        size = self.shape[0]
+        if self.shape[1] != size:
+            raise ValueError("Matrix must be square.")
+        if modulo is not None:
+            return self._power_modulo(k, modulo)
+        if k < 0:
+            return self.inverse().power(-k)
+        if k == 0:
+            return Matrix.identity(size, self.backend)
+
+        base = self.copy()
+        square = self.copy()
+        product = self.copy()
+        while not k & 1:
+            Matrix.gemm(1.0, base, base, 0.0, square)
+            base, square = square, base
+            k >>= 1
+        result = base.copy()
+        k >>= 1
+        while k:
+            Matrix.gemm(1.0, base, base, 0.0, square)
+            base, square = square, base
+            if k & 1:
+                Matrix.gemm(1.0, result, base, 0.0, product)
+                result, product = product, result
+            k >>= 1
+        return result
+
+    def _power_modulo(self, k: int, modulo: int) -> "Matrix":
+        """
+        Raises an integer matrix to a non-negative power modulo a number.
+        NumPy int64 kernels are used while the sums of products cannot overflow,
+        otherwise Python integers.
+        """
+
+        if k < 0:
+            raise ValueError(
+                "Negative powers are not supported with a modulo."
+            )
+        if not 1 < modulo <= 2**53:
+            raise ValueError("Modulo must be in the range (1, 2**53].")
+        values = [value for row in self.get() for value in row]
+        if not all(value == int(value) for value in values):
+            raise ValueError("Power modulo needs an integer matrix.")
+
+        size = self.shape[0]
+        flat = [int(value) % modulo for value in values]
+        if self.backend == "numpy" and (modulo - 1) ** 2 * size < 2**63:
+            base = np.array(flat, dtype=np.int64).reshape(size, size)
+            square = np.empty_like(base)
+            result = np.identity(size, dtype=np.int64)
+            product = np.empty_like(base)
+            while k:
+                if k & 1:
+                    np.matmul(result, base, out=product)
+                    np.remainder(product, modulo, out=product)
+                    result, product = product, result
+                k >>= 1
+                if k:
+                    np.matmul(base, base, out=square)
+                    np.remainder(square, modulo, out=square)
+                    base, square = square, base
+            return Matrix._wrap(result.astype(np.float64), "numpy")
+
+        def multiply(
+            left: List[int], right: List[int], out: List[int]
+        ) -> None:
+            columns = [right[j::size] for j in range(size)]
+            for i in range(size):
+                row = left[i * size : (i + 1) * size]
+                out[i * size : (i + 1) * size] = [
+                    sum(map(mul, row, column)) % modulo for column in columns
+                ]
+
+        base_list = flat
+        square_list = [0] * (size * size)
+        result_list = [int(i % (size + 1) == 0) for i in range(size * size)]
+        product_list = [0] * (size * size)
+        while k:
+            if k & 1:
+                multiply(result_list, base_list, product_list)
+                result_list, product_list = product_list, result_list
+            k >>= 1
+            if k:
+                multiply(base_list, base_list, square_list)
+                base_list, square_list = square_list, base_list
+        return Matrix._wrap(
+            array("d", result_list), "python", (size, size)
+        )._as_backend(self.backend)
+
+    def lazy(self) -> Any:
+        """
+        Returns the matrix as a leaf of a lazy expression (see `LazyMatrix`).
+        """
+
+        from project.lazy_matrix import LazyMatrix
+
+        return LazyMatrix.leaf(self)
+
+    def matvec(self, vector: "Vector") -> "Vector":
+        """
+        Multiplies the matrix by a column vector: `A * v`.
+        """
+
+        if self.shape[1] != len(vector._data):
+            raise ValueError("Vector has incompatible dimension.")
+        if self.backend == "numpy":
+            return Vector._wrap(
+                self._data @ vector._as_backend("numpy"), "numpy"
+            )
+        data = vector._as_backend("python")
+        return Vector._wrap(
+            array("d", [sum(map(mul, row, data)) for row in self._rows()]),
+            "python",
+        )
+
+    def vecmat(self, vector: "Vector") -> "Vector":
+        """
+        Multiplies a row vector by the matrix: `v * A`.
+        """
+
+        if self.shape[0] != len(vector._data):
+            raise ValueError("Vector has incompatible dimension.")
+        return self.transpose().matvec(vector)
+
+    def matmul(
+        self, other_matrix: "Matrix", workers: int = 1, executor: Any = None
+    ) -> "Matrix":
+        """
+        Multiplies two matrices, computing blocks of the result rows concurrently.
+
+        Args:
+            other_matrix (Matrix): the right operand.
+            workers (int): the number of row blocks computed at the same time.
+            executor (Any): "thread" runs the blocks on `ThreadPool` (for the numpy
+                backend, whose BLAS kernel releases the GIL), "process" runs them
+                on a process pool (for the pure Python kernel). An existing
+                `ThreadPool` or `concurrent.futures.Executor` is used as is.
+                None picks "thread" for numpy and "process" for python.
+
+        Returns:
+            result (Matrix): the product in the backend of this matrix.
+        """
+
+        if workers <= 0:
+            raise ValueError("The number of workers must be greater than 0")
+        if self.shape[1] != other_matrix.shape[0]:
+            raise ValueError(f"Matrices can't be multiplied.")
+        if workers == 1 and executor is None:
+            return self * other_matrix
+
+        other = other_matrix._as_backend(self.backend)
+        if executor is None:
+            executor = "thread" if self.backend == "numpy" else "process"
+        count_rows, count_columns = self.shape[0], other.shape[1]
+        count_blocks = min(workers, count_rows)
+        bounds = [
+            (
+                count_rows * i // count_blocks,
+                count_rows * (i + 1) // count_blocks,
+            )
+            for i in range(count_blocks)
+        ]
+
+        result: Any
+        if self.backend == "numpy":
+            result = np.empty((count_rows, count_columns), dtype=np.float64)
+            right: Any = other._data
+            blocks: List[Any] = [
+                self._data[start:stop] for start, stop in bounds
+            ]
+        else:
+            result = array("d", bytes(8 * count_rows * count_columns))
+            right = [
+                array("d", column) for column in other.transpose()._rows()
+            ]
+            blocks = [
+                [array("d", row) for row in self[start:stop, :]._rows()]
+                for start, stop in bounds
+            ]
+
+        def store(start: int, stop: int, block: Any) -> None:
+            if self.backend == "numpy":
+                result[start:stop] = block
+            else:
+                result[start * count_columns : stop * count_columns] = block
+
+        def compute(start: int, stop: int, block: Any) -> None:
+            if self.backend == "numpy":
+                np.matmul(block, right, out=result[start:stop])
+            else:
+                store(start, stop, classical_product(block, right))
+
+        if executor == "thread" or isinstance(executor, ThreadPool):
+            pool = (
+                ThreadPool(count_blocks) if executor == "thread" else executor
+            )
+            tasks = [
+                pool.enqueue(compute, start, stop, block)
+                for (start, stop), block in zip(bounds, blocks)
+            ]
+            if executor == "thread":
+                pool.dispose()
+            for task in tasks:
+                task.get_res()
+        elif executor == "process":
+            with ProcessPoolExecutor(
+                count_blocks, initializer=_set_worker_right, initargs=(right,)
+            ) as pool:
+                for (start, stop), block in zip(
+                    bounds, pool.map(_block_product, blocks)
+                ):
+                    store(start, stop, block)
+        elif isinstance(executor, Executor):
+            futures = [
+                executor.submit(_block_product, block, right)
+                for block in blocks
+            ]
+            for (start, stop), future in zip(bounds, futures):
+                store(start, stop, future.result())
+        else:
+            raise ValueError(f"Unknown executor '{executor}'.")
+
+        if self.backend == "numpy":
+            return Matrix._wrap(result, "numpy")
+        return Matrix._wrap(result, "python", (count_rows, count_columns))
+
+    def _padded(self, size: int) -> List[float]:
+        """
+        Returns the "python" storage as a flat square list of the given size,
+        padded with zeros on the right and at the bottom.
+        """
+
+        padding = [0.0] * (size - self._shape[1])
+        flat: List[float] = []
+        for row in self._rows():
+            flat.extend(row)
+            flat.extend(padding)
+        flat.extend([0.0] * (size * (size - self._shape[0])))
+        return flat
+
+    def _index(self, key: Any, size: int) -> Tuple[int, int, int]:
+        """
+        Converts an index or a slice along one axis into (start, count, step).
+        """
+
+        if isinstance(key, slice):
+            start, stop, step = key.indices(size)
+            if step <= 0:
+                raise ValueError("Only positive slice steps are supported.")
+            return start, len(range(start, stop, step)), step
+        if key < 0:
+            key += size
+        if not 0 <= key < size:
+            raise IndexError("Matrix index out of range.")
+        return key, 1, 1
+
+    def __getitem__(self, key: Any) -> Any:
+        """
+        Returns the element `matrix[i, j]`, or a view of the selected rows and
+        columns if any of the indices is a slice (`matrix[i]` selects a row).
+        """
+
+        if not isinstance(key, tuple):
+            key = (key, slice(None))
+        row_key, column_key = key
+        if isinstance(row_key, int) and isinstance(column_key, int):
+            if self.backend == "numpy":
+                return float(self._data[row_key, column_key])
+            row_num, _, _ = self._index(row_key, self._shape[0])
+            column_num, _, _ = self._index(column_key, self._shape[1])
+            return self._data[
+                self._offset
+                + row_num * self._strides[0]
+                + column_num * self._strides[1]
+            ]
+
+        row_start, count_rows, row_step = self._index(row_key, self.shape[0])
+        column_start, count_columns, column_step = self._index(
+            column_key, self.shape[1]
+        )
+        if count_rows == 0 or count_columns == 0:
+            raise IndexError("Matrix view must not be empty.")
+        if self.backend == "numpy":
+            return Matrix._wrap(
+                self._data[
+                    row_start : row_start + count_rows * row_step : row_step,
+                    column_start : column_start
+                    + count_columns * column_step : column_step,
+                ],
+                "numpy",
+                version=self._version,
+            )
+        row_stride, column_stride = self._strides
+        return Matrix._wrap(
+            self._data,
+            "python",
+            (count_rows, count_columns),
+            (row_stride * row_step, column_stride * column_step),
+            self._offset
+            + row_start * row_stride
+            + column_start * column_stride,
+            self._version,
+        )
+
+    def __setitem__(self, key: Tuple[int, int], value: float) -> None:
+        """
+        Sets the element `matrix[i, j]`. Views share the change with their base.
+        """
+
+        row_key, column_key = key
+        self._touch()
+        if self.backend == "numpy":
+            self._data[row_key, column_key] = value
+            return
+        row_num, _, _ = self._index(row_key, self._shape[0])
+        column_num, _, _ = self._index(column_key, self._shape[1])
+        self._data[
+            self._offset
+            + row_num * self._strides[0]
+            + column_num * self._strides[1]
+        ] = value
+
+    def row(self, i: int) -> "Matrix":
+        """
+        Returns a 1xN view of the i-th row.
+        """
+
+        return self[i, :]
+
+    def column(self, j: int) -> "Matrix":
+        """
+        Returns an Nx1 view of the j-th column.
+        """
+
+        return self[:, j]
+
+    def copy(self) -> "Matrix":
+        """
+        Returns a contiguous row-major copy of the matrix.
+        """
 
-    `is_matrix(list_of_lists: List[List[float]]) -> bool`:
-        Static method to check if a 2D list is a valid matrix.
+        if self.backend == "numpy":
+            return Matrix._wrap(np.array(self._data, order="C"), "numpy")
+        data = array("d")
+        for row in self._rows():
+            data.extend(row)
+        return Matrix._wrap(data, "python", self._shape)
 
-    `get() -> List[List[float]]`:
-        Returns a list representation of the matrix.
-    """
+    def _is_contiguous(self) -> bool:
+        """
+        Checks whether the elements are stored densely in the row-major order.
+        """
+
+        if self.backend == "numpy":
+            return bool(self._data.flags.c_contiguous)
+        return self._shape[0] == 1 or self._strides == (self._shape[1], 1)
 
-    def __init__(self, matrix: List[List[float]]):
+    def to_memoryview(self) -> "memoryview[Any]":
         """
-        Initializes a Matrix object.
+        Returns a 2D memoryview of the data without copying it. Views that are
+        not contiguous in the row-major order (e.g. a transpose of the "python"
+        backend) have to be copied first.
         """
 
-        if not Matrix.is_matrix(matrix):
-            raise TypeError("Input must be a valid matrix.")
+        if self.backend == "numpy":
+            return memoryview(self._data)
+        if not self._is_contiguous():
+            raise BufferError("Matrix is not contiguous, use copy() first.")
+        count_rows, count_columns = self._shape
+        flat = memoryview(self._data)[
+            self._offset : self._offset + count_rows * count_columns
+        ]
+        return flat.cast("B").cast("d", [count_rows, count_columns])
+
+    def __buffer__(self, flags: int) -> "memoryview[Any]":
+        """
+        Exposes the data through the buffer protocol (PEP 688, Python 3.12+).
+        """
 
-        self.matrix = matrix
+        return self.to_memoryview()
 
-    def __add__(self, other_matrix: "Matrix") -> "Matrix":
+    def __array__(self, dtype: Any = None, copy: Any = None) -> Any:
         """
-        Adds two matrices and returns a new matrix.
+        Converts the matrix to an ndarray, sharing the data when it is contiguous.
         """
 
-        count_rows = len(self.matrix)
-        count_columns = len(self.matrix[0])
-        add_matrix = [
-            [0.0 for _ in range(count_columns)] for _ in range(count_rows)
-        ]
+        if self.backend == "numpy":
+            data = self._data
+        elif self._is_contiguous():
+            data = np.asarray(self.to_memoryview())
+        else:
+            data = np.asarray(self.get(), dtype=np.float64)
+        return np.array(data, dtype=dtype, copy=True) if copy else data
 
-        if count_rows != len(other_matrix.matrix) or count_columns != len(
-            other_matrix.matrix[0]
-        ):
-            raise ValueError("Matrix 'other_matrix' has wrong dimension.")
+    @classmethod
+    def from_buffer(
+        cls, buffer: Any, shape: Tuple[int, int], backend: Optional[str] = None
+    ) -> "Matrix":
+        """
+        Creates a matrix over an object supporting the buffer protocol (bytes,
+        bytearray, mmap, array('d'), ndarray...) with doubles in the row-major
+        order, without copying them. Read-only buffers give read-only matrices.
+        """
 
-        for row_num in range(count_rows):
-            for column_num in range(count_columns):
-                add_matrix[row_num][column_num] = (
-                    self.matrix[row_num][column_num]
-                    + other_matrix.matrix[row_num][column_num]
-                )
-        return Matrix(add_matrix)
+        count_rows, count_columns = shape
+        if count_rows <= 0 or count_columns <= 0:
+            raise TypeError("Input must be a valid matrix.")
+        backend = resolve_backend(backend)
+        data = memoryview(buffer).cast("B").cast("d")
+        if len(data) != count_rows * count_columns:
+            raise ValueError("Buffer size does not match the shape.")
+        if backend == "numpy":
+            return Matrix._wrap(np.asarray(data).reshape(shape), "numpy")
+        return Matrix._wrap(data, "python", (count_rows, count_columns))
 
-    def transpose(self) -> "Matrix":
+    def to_bytes(self) -> bytes:
         """
-        Transposes the matrix (flips rows and columns).
+        Returns the elements as doubles in the row-major order.
         """
 
-        count_rows = len(self.matrix)
-        count_columns = len(self.matrix[0])
-        transposed = [
-            [0.0 for _ in range(count_rows)] for _ in range(count_columns)
-        ]
+        if self.backend == "numpy":
+            return self._data.tobytes()
+        if self._is_contiguous():
+            return self.to_memoryview().tobytes()
+        return self.copy()._data.tobytes()
+
+    def save(self, path: str) -> None:
+        """
+        Saves the matrix to a `.npy` file, readable by `numpy.load` and `load`.
+        """
 
-        for i in range(count_rows):
-            for j in range(count_columns):
-                transposed[j][i] = self.matrix[i][j]
-        return Matrix(transposed)
+        matrix = self if self._is_contiguous() else self.copy()
+        write_npy(path, self.shape, matrix.to_memoryview())
 
-    def __mul__(self, other_matrix: "Matrix") -> "Matrix":
+    @staticmethod
+    def load(
+        path: str, mmap: bool = False, backend: Optional[str] = None
+    ) -> "Matrix":
         """
-        Multiplies two matrices and returns a new matrix.
+        Loads a matrix from a 2D float64 `.npy` file. With `mmap=True` the file
+        is mapped read-only instead of being read, so only the touched pages are
+        loaded and the matrix cannot be changed.
         """
 
-        count_rows_left = len(self.matrix)
-        count_rows_right = len(other_matrix.matrix)
-        count_columns_left = len(self.matrix[0])
-        count_columns_right = len(other_matrix.matrix[0])
-        if count_columns_left != count_rows_right:
-            raise ValueError(f"Matrices can't be multiplied.")
-        multi_matrix = [
-            [0.0 for _ in range(count_columns_right)]
-            for _ in range(count_rows_left)
-        ]
-        for m in range(count_rows_left):
-            for n in range(count_columns_right):
-                for o in range(count_columns_left):
-                    multi_matrix[m][n] += (
-                        self.matrix[m][o] * other_matrix.matrix[o][n]
-                    )
-        return Matrix(multi_matrix)
+        backend = resolve_backend(backend)
+        shape, fortran_order, data = read_npy(path, mmap)
+        if len(shape) != 2 or 0 in shape:
+            raise TypeError("Input must be a valid matrix.")
+        count_rows, count_columns = shape
+        if fortran_order:
+            count_rows, count_columns = count_columns, count_rows
+        matrix = Matrix.from_buffer(data, (count_rows, count_columns), backend)
+        return matrix.transpose() if fortran_order else matrix
 
     def get(self) -> List[List[float]]:
         """
         Returns a list representation of the matrix.
         """
 
-        return self.matrix
+        if self.backend == "numpy":
+            return self._data.tolist()
+        return [row.tolist() for row in self._rows()]
 
     @staticmethod
     def is_matrix(list_of_lists: List[List[float]]) -> bool:
@@ -114,7 +1524,8 @@ class Matrix:
         if not list_of_lists or not list_of_lists[0]:
             return False
 
-        return all(len(row) == len(list_of_lists[0]) for row in list_of_lists)
+        count_columns = len(list_of_lists[0])
+        return all(len(row) == count_columns for row in list_of_lists)
 
 
 class Vector:
@@ -123,6 +1534,9 @@ class Vector:
     It provides functionality to vectors, such as calculating
     the vector's magnitude, dot product.
 
+    Like `Matrix`, the data is stored by the "python" backend (a flat `array('d')`)
+    or the "numpy" backend (a float64 ndarray).
+
     Methods:
     -------
     `len() -> float`:
@@ -131,60 +1545,783 @@ class Vector:
     `__add__(other_vector: "Vector") -> "Vector"`:
         Performs matrix addition and returns a new matrix.
 
-    `dot_product(vec_1: "Vector", vec_2: "Vector") -> float`:
+    `__iadd__(other_vector: "Vector") -> "Vector"`, `__imul__(alpha: float) -> "Vector"`:
+        Add a vector or multiply by a number in place.
+
+    `add(other_vector: "Vector", out: "Vector") -> "Vector"`, `scale(alpha: float, out: "Vector") -> "Vector"`:
+        Perform addition or multiplication by a number, writing into `out`.
+
+    `axpy(alpha: float, other_vector: "Vector") -> "Vector"`:
+        Adds a scaled vector in place.
+
+    `__mul__(matrix: Matrix) -> "Vector"`:
+        Multiplies the row vector by a matrix (or a number) and returns a new vector.
+
+    `dot_product(vec_1: "Vector", vec_2: "Vector", stable: bool) -> float`:
         Static method to calculate the dot product of two vectors.
 
-    `angle_between_vectors(vec_1: "Vector", vec_2: "Vector") -> float`:
+    `dot_and_norms(vec_1: "Vector", vec_2: "Vector") -> Tuple[float, float, float]`:
+        Static method to calculate the dot product and both lengths, reusing cached lengths.
+
+    `angle_between_vectors(vec_1: "Vector", vec_2: "Vector", stable: bool) -> float`:
         Static method to calculate the angle (in radians) between two vectors.
+
+    `from_buffer(buffer: Any) -> "Vector"`, `to_bytes() -> bytes`:
+        Create a vector over a buffer of doubles without copying, or export the data.
+
+    `save(path: str)`, `load(path: str, mmap: bool) -> "Vector"`:
+        Save to or load from a `.npy` file, optionally memory-mapped read-only.
+
+    `to_memoryview() -> memoryview`, `__buffer__`, `__array__`:
+        Expose the data to memoryview and NumPy without copying.
+
+    `get() -> List[float]`:
+        Returns a list representation of the vector.
     """
 
-    def __init__(self, vector: List[float]) -> None:
+    def __init__(self, vector: Any, backend: Optional[str] = None) -> None:
         """
         Initializes a Vector object.
+
+        Args:
+            vector (List[float]): a list (or a 1D ndarray) with the data.
+            backend (Optional[str]): "python", "numpy" or None to pick NumPy
+                automatically when it is importable.
         """
 
+        self.backend = resolve_backend(backend)
         if len(vector) == 0:
             raise TypeError("Input must be a valid vector.")
-        self.vec = vector
+        if HAS_NUMPY and isinstance(vector, np.ndarray):
+            if vector.ndim != 1:
+                raise TypeError("Input must be a valid vector.")
+            if self.backend == "python":
+                vector = vector.tolist()
+
+        self._data: Any
+        if self.backend == "numpy":
+            self._data = np.ascontiguousarray(vector, dtype=np.float64)
+        else:
+            self._data = array("d", vector)
+        self._norm: Optional[float] = None
+
+    @classmethod
+    def _wrap(cls, data: Any, backend: str) -> "Vector":
+        """
+        Creates a vector over an existing array without validating or copying it.
+        """
+
+        result = cls.__new__(cls)
+        result.backend = backend
+        result._data = data
+        result._norm = None
+        return result
+
+    def _touch(self) -> None:
+        """
+        Drops the cached norm, must be called after every change of the data.
+        """
+
+        self._norm = None
+
+    @property
+    def vec(self) -> List[float]:
+        """
+        The list representation of the vector.
+        """
+
+        return self.get()
+
+    def _as_backend(self, backend: str) -> Any:
+        """
+        Returns the data of the vector in the storage of the given backend.
+        """
+
+        if self.backend == backend:
+            return self._data
+        if backend == "numpy":
+            return np.asarray(self._data, dtype=np.float64)
+        return self._data.tolist()
+
+    def _check_out(self, out: "Vector") -> None:
+        """
+        Checks that `out` can receive a result of the dimension of this vector.
+        """
+
+        if out.backend != self.backend:
+            raise ValueError("Vector 'out' must use the same backend.")
+        if len(out._data) != len(self._data):
+            raise ValueError("Vector 'out' has wrong dimension.")
 
     def __add__(self, other_vector: "Vector") -> "Vector":
         """
         Adds two vectors and returns a new vector.
         """
 
-        if len(self.vec) != len(other_vector.vec):
+        if not isinstance(other_vector, Vector):
+            return NotImplemented
+        return self.add(other_vector)
+
+    def __iadd__(self, other_vector: "Vector") -> "Vector":
+        """
+        Adds the other vector to this one in place.
+        """
+
+        if not isinstance(other_vector, Vector):
+            return NotImplemented
+        return self.add(other_vector, out=self)
+
+    def add(
+        self, other_vector: "Vector", out: Optional["Vector"] = None
+    ) -> "Vector":
+        """
+        Adds two vectors. If `out` is given (it may be one of the operands),
+        the result is written into it instead of a new vector.
+        """
+
+        other = other_vector._as_backend(self.backend)
+        if len(self._data) != len(other):
+            raise ValueError("Vector 'other_vector' has wrong dimension.")
+        if out is not None:
+            self._check_out(out)
+        if self.backend == "numpy":
+            if out is None:
+                return Vector._wrap(self._data + other, "numpy")
+            np.add(self._data, other, out=out._data)
+            out._touch()
+            return out
+
+        new_vec = array("d", map(add, self._data, other))
+        if out is None:
+            return Vector._wrap(new_vec, "python")
+        out._data[:] = new_vec
+        out._touch()
+        return out
+
+    def scale(self, alpha: float, out: Optional["Vector"] = None) -> "Vector":
+        """
+        Multiplies the vector by a number, writing into `out` if it is given.
+        """
+
+        if out is not None:
+            self._check_out(out)
+        if self.backend == "numpy":
+            if out is None:
+                return Vector._wrap(self._data * alpha, "numpy")
+            np.multiply(self._data, alpha, out=out._data)
+            out._touch()
+            return out
+
+        new_vec = array("d", [alpha * value for value in self._data])
+        if out is None:
+            return Vector._wrap(new_vec, "python")
+        out._data[:] = new_vec
+        out._touch()
+        return out
+
+    def axpy(self, alpha: float, other_vector: "Vector") -> "Vector":
+        """
+        Adds the other vector multiplied by a number in place: `self += alpha * other`.
+        The numpy backend creates one temporary for `alpha * other`.
+        """
+
+        other = other_vector._as_backend(self.backend)
+        if len(self._data) != len(other):
             raise ValueError("Vector 'other_vector' has wrong dimension.")
-        new_vec = [0.0 for _ in range(len(self.vec))]
-        for i in range(len(self.vec)):
-            new_vec[i] = self.vec[i] + other_vector.vec[i]
+        self._touch()
+        if self.backend == "numpy":
+            if alpha == 1:
+                self._data += other
+            else:
+                self._data += alpha * other
+            return self
+
+        self._data[:] = array(
+            "d", [value + alpha * x for value, x in zip(self._data, other)]
+        )
+        return self
+
+    def __mul__(self, matrix: Any) -> Any:
+        """
+        Multiplies the row vector by a matrix or by a number and returns a new vector.
+        """
+
+        if isinstance(matrix, (int, float)):
+            return self.scale(matrix)
+        if not isinstance(matrix, Matrix):
+            return NotImplemented
+        return matrix.vecmat(self)
+
+    def __rmul__(self, alpha: Any) -> Any:
+        """
+        Multiplies a number by the vector.
+        """
+
+        if not isinstance(alpha, (int, float)):
+            return NotImplemented
+        return self.scale(alpha)
+
+    def __imul__(self, alpha: Any) -> Any:
+        """
+        Multiplies the vector by a number in place.
+        """
 
-        return Vector(new_vec)
+        if not isinstance(alpha, (int, float)):
+            return NotImplemented
+        return self.scale(alpha, out=self)
 
     def len(self) -> float:
         """
-        Returns the magnitude (length) of the vector.
+        Returns the magnitude (length) of the vector. It does not overflow or
+        underflow for large or tiny elements, and it is cached until the vector
+        is changed by one of its methods (changes made directly through a shared
+        buffer or ndarray are not seen).
+        """
+
+        if self._norm is None:
+            if self.backend == "numpy":
+                self._norm = _norm_numpy(self._data)
+            else:
+                self._norm = math.hypot(*self._data)
+        return self._norm
+
+    def to_memoryview(self) -> "memoryview[Any]":
+        """
+        Returns a memoryview of the data without copying it.
+        """
+
+        return memoryview(self._data)
+
+    def __buffer__(self, flags: int) -> "memoryview[Any]":
+        """
+        Exposes the data through the buffer protocol (PEP 688, Python 3.12+).
+        """
+
+        return self.to_memoryview()
+
+    def __array__(self, dtype: Any = None, copy: Any = None) -> Any:
+        """
+        Converts the vector to an ndarray sharing the data.
+        """
+
+        data = np.asarray(self._data)
+        return np.array(data, dtype=dtype, copy=True) if copy else data
+
+    @classmethod
+    def from_buffer(
+        cls, buffer: Any, backend: Optional[str] = None
+    ) -> "Vector":
+        """
+        Creates a vector over an object supporting the buffer protocol with
+        doubles, without copying them.
+        """
+
+        backend = resolve_backend(backend)
+        data = memoryview(buffer).cast("B").cast("d")
+        if len(data) == 0:
+            raise TypeError("Input must be a valid vector.")
+        if backend == "numpy":
+            return Vector._wrap(np.asarray(data), "numpy")
+        return Vector._wrap(data, "python")
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the elements as doubles.
+        """
+
+        return self.to_memoryview().tobytes()
+
+    def save(self, path: str) -> None:
+        """
+        Saves the vector to a `.npy` file, readable by `numpy.load` and `load`.
         """
 
-        return math.sqrt(Vector.dot_product(self, self))
+        write_npy(path, (len(self._data),), self.to_memoryview())
 
     @staticmethod
-    def dot_product(vec_1: "Vector", vec_2: "Vector") -> float:
+    def load(
+        path: str, mmap: bool = False, backend: Optional[str] = None
+    ) -> "Vector":
         """
-        Calculates the dot product of two vectors.
+        Loads a vector from a 1D float64 `.npy` file, mapping it read-only if
+        `mmap` is set.
         """
 
-        if len(vec_1.vec) != len(vec_2.vec):
+        shape, _, data = read_npy(path, mmap)
+        if len(shape) != 1:
+            raise TypeError("Input must be a valid vector.")
+        return Vector.from_buffer(data, backend)
+
+    def get(self) -> List[float]:
+        """
+        Returns a list representation of the vector.
+        """
+
+        return self._data.tolist()
+
+    @staticmethod
+    def dot_product(
+        vec_1: "Vector", vec_2: "Vector", stable: bool = False
+    ) -> float:
+        """
+        Calculates the dot product of two vectors. With `stable=True` the sum is
+        correctly rounded (`math.fsum`), at about 1.5 times the cost.
+        """
+
+        other = vec_2._as_backend(vec_1.backend)
+        if len(vec_1._data) != len(other):
+            raise ValueError("Vectors have incompatible dimension.")
+        if stable:
+            return math.fsum(map(mul, vec_1._data.tolist(), list(other)))
+        if vec_1.backend == "numpy":
+            return float(np.dot(vec_1._data, other))
+        return sum(map(mul, vec_1._data, other))
+
+    @staticmethod
+    def dot_and_norms(
+        vec_1: "Vector", vec_2: "Vector"
+    ) -> Tuple[float, float, float]:
+        """
+        Returns the dot product and the lengths of two vectors in one call.
+        Cached lengths are reused and missing ones are cached, so comparing one
+        vector with many others computes its length only once. The numpy
+        backend gets all three values from a single BLAS call.
+        """
+
+        other = vec_2._as_backend(vec_1.backend)
+        if len(vec_1._data) != len(other):
             raise ValueError("Vectors have incompatible dimension.")
-        result = 0.0
-        for i in range(len(vec_1.vec)):
-            result += vec_1.vec[i] * vec_2.vec[i]
+        if vec_1.backend == "python":
+            return sum(map(mul, vec_1._data, other)), vec_1.len(), vec_2.len()
+
+        with np.errstate(over="ignore", under="ignore"):
+            if vec_1._norm is None and vec_2._norm is None:
+                pair = np.stack((vec_1._data, other))
+                gram = pair @ pair.T
+                norms = np.sqrt(gram.diagonal())
+                if np.all(np.isfinite(norms)) and np.all(norms > 0):
+                    vec_1._norm = float(norms[0])
+                    vec_2._norm = float(norms[1])
+                    return float(gram[0, 1]), vec_1._norm, vec_2._norm
+            dot = float(np.dot(vec_1._data, other))
+        return dot, vec_1.len(), vec_2.len()
+
+    @staticmethod
+    def angle_between_vectors(
+        vec_1: "Vector", vec_2: "Vector", stable: bool = False
+    ) -> float:
+        """
+        Calculates the angle (in radians) between two vectors. The cosine is
+        clipped to [-1, 1] against rounding errors, and the stable formula is
+        used when the dot product or the lengths overflow or underflow.
+
+        With `stable=True` the angle is computed as
+        `2 * atan2(|a |b| - b |a||, |a |b| + b |a||)`, which is accurate also
+        for nearly parallel vectors where `acos` loses half of the digits.
+        """
+
+        if stable:
+            return Vector._stable_angle(vec_1, vec_2)
+        dot, norm_1, norm_2 = Vector.dot_and_norms(vec_1, vec_2)
+        if norm_1 == 0 or norm_2 == 0:
+            raise ZeroDivisionError("Angle with a zero vector is undefined.")
+        scale = norm_1 * norm_2
+        if scale == 0 or math.isinf(scale) or math.isinf(dot):
+            return Vector._stable_angle(vec_1, vec_2)
+        return math.acos(max(-1.0, min(1.0, dot / scale)))
+
+    @staticmethod
+    def _stable_angle(vec_1: "Vector", vec_2: "Vector") -> float:
+        """
+        Computes the angle with the formula of W. Kahan from the unit vectors.
+        """
+
+        norm_1, norm_2 = vec_1.len(), vec_2.len()
+        if norm_1 == 0 or norm_2 == 0:
+            raise ZeroDivisionError("Angle with a zero vector is undefined.")
+        unit_1 = [value / norm_1 for value in vec_1._data.tolist()]
+        unit_2 = [value / norm_2 for value in vec_2._as_backend("python")]
+        if len(unit_1) != len(unit_2):
+            raise ValueError("Vectors have incompatible dimension.")
+        difference = math.hypot(*map(sub, unit_1, unit_2))
+        total = math.hypot(*map(add, unit_1, unit_2))
+        return 2 * math.atan2(difference, total)
+
+
+class LUDecomposition:
+    """
+    An LU decomposition with partial pivoting `P * A = L * U` of a square
+    matrix. `L` (unit lower triangular) and `U` (upper triangular) are stored
+    together in one matrix, and `perm[i]` is the row of `A` moved to the i-th
+    row. The factorization costs O(n^3) once, after which every solve costs
+    O(n^2) per right-hand side.
+
+    Methods:
+    -------
+    `solve(b: Any) -> Any`:
+        Solves `A x = b` for a `Vector` or for every column of a `Matrix`.
+
+    `det() -> float`:
+        Returns the determinant of `A`.
+
+    `inverse() -> Matrix`:
+        Returns the inverse of `A`.
+    """
+
+    def __init__(
+        self, lu: Any, perm: List[int], sign: int, singular: bool, backend: str
+    ) -> None:
+        """
+        Initializes an LUDecomposition object.
+
+        Args:
+            lu (Any): the combined factors, a list of rows or a 2D ndarray.
+            perm (List[int]): the row permutation.
+            sign (int): the sign of the permutation, 1 or -1.
+            singular (bool): whether a zero pivot was met.
+            backend (str): the backend of the factorized matrix.
+        """
+
+        self.lu = lu
+        self.perm = perm
+        self.sign = sign
+        self.singular = singular
+        self.backend = backend
+
+    @classmethod
+    def factorize(
+        cls, matrix: Matrix, block_size: Optional[int] = None
+    ) -> "LUDecomposition":
+        """
+        Factorizes a square matrix with partial pivoting.
+
+        Args:
+            matrix (Matrix): the matrix to factorize, it is not changed.
+            block_size (Optional[int]): the panel width of the blocked (right-looking)
+                variant of the numpy backend: a panel is factorized column by
+                column and the trailing matrix is updated by one BLAS product.
+                None uses `LU_BLOCK_SIZE` for matrices larger than it.
+
+        Returns:
+            result (LUDecomposition): the decomposition.
+        """
+
+        size = matrix.shape[0]
+        if matrix.shape[1] != size:
+            raise ValueError("Matrix must be square.")
+        if matrix.backend == "numpy":
+            return cls._factorize_numpy(
+                matrix._data, block_size or LU_BLOCK_SIZE
+            )
+
+        lu = [row.tolist() for row in matrix._rows()]
+        perm = list(range(size))
+        sign = 1
+        singular = False
+        for k in range(size):
+            pivot = max(range(k, size), key=lambda i: abs(lu[i][k]))
+            if lu[pivot][k] == 0:
+                singular = True
+                continue
+            if pivot != k:
+                lu[k], lu[pivot] = lu[pivot], lu[k]
+                perm[k], perm[pivot] = perm[pivot], perm[k]
+                sign = -sign
+            pivot_row = lu[k]
+            pivot_tail = pivot_row[k + 1 :]
+            for row in lu[k + 1 :]:
+                factor = row[k] / pivot_row[k]
+                row[k] = factor
+                if factor:
+                    row[k + 1 :] = [
+                        value - factor * pivot_value
+                        for value, pivot_value in zip(row[k + 1 :], pivot_tail)
+                    ]
+        return cls(lu, perm, sign, singular, "python")
+
+    @classmethod
+    def _factorize_numpy(cls, data: Any, block_size: int) -> "LUDecomposition":
+        """
+        The blocked right-looking factorization of a 2D ndarray.
+        """
+
+        lu = np.array(data, dtype=np.float64)
+        size = lu.shape[0]
+        perm = list(range(size))
+        sign = 1
+        singular = False
+        for start in range(0, size, block_size):
+            stop = min(start + block_size, size)
+            for k in range(start, stop):
+                pivot = k + int(np.argmax(np.abs(lu[k:, k])))
+                if lu[pivot, k] == 0:
+                    singular = True
+                    continue
+                if pivot != k:
+                    lu[[k, pivot]] = lu[[pivot, k]]
+                    perm[k], perm[pivot] = perm[pivot], perm[k]
+                    sign = -sign
+                lu[k + 1 :, k] /= lu[k, k]
+                lu[k + 1 :, k + 1 : stop] -= np.outer(
+                    lu[k + 1 :, k], lu[k, k + 1 : stop]
+                )
+            if stop < size:
+                for i in range(start + 1, stop):
+                    lu[i, stop:] -= lu[i, start:i] @ lu[start:i, stop:]
+                lu[stop:, stop:] -= (
+                    lu[stop:, start:stop] @ lu[start:stop, stop:]
+                )
+        return cls(lu, perm, sign, singular, "numpy")
+
+    @property
+    def L(self) -> Matrix:
+        """
+        The unit lower triangular factor.
+        """
+
+        size = len(self.perm)
+        return Matrix(
+            [
+                [
+                    1.0 if i == j else self.lu[i][j] if j < i else 0.0
+                    for j in range(size)
+                ]
+                for i in range(size)
+            ],
+            backend=self.backend,
+            assume_valid=True,
+        )
+
+    @property
+    def U(self) -> Matrix:
+        """
+        The upper triangular factor.
+        """
+
+        size = len(self.perm)
+        return Matrix(
+            [
+                [self.lu[i][j] if j >= i else 0.0 for j in range(size)]
+                for i in range(size)
+            ],
+            backend=self.backend,
+            assume_valid=True,
+        )
+
+    def _substitute(self, rhs: List[float]) -> List[float]:
+        """
+        Solves `L U x = P b` for one right-hand side of the "python" backend.
+        """
+
+        size = len(self.perm)
+        x = [rhs[p] for p in self.perm]
+        for i in range(1, size):
+            x[i] -= sum(map(mul, self.lu[i][:i], x[:i]))
+        for i in reversed(range(size)):
+            row = self.lu[i]
+            x[i] = (x[i] - sum(map(mul, row[i + 1 :], x[i + 1 :]))) / row[i]
+        return x
+
+    def _substitute_numpy(self, rhs: Any) -> Any:
+        """
+        Solves `L U X = P B` for a 1D or a 2D ndarray of right-hand sides.
+        """
+
+        x = rhs[self.perm].astype(np.float64)
+        for i in range(1, len(self.perm)):
+            x[i] -= self.lu[i, :i] @ x[:i]
+        for i in reversed(range(len(self.perm))):
+            x[i] = (x[i] - self.lu[i, i + 1 :] @ x[i + 1 :]) / self.lu[i, i]
+        return x
+
+    def solve(self, b: Any) -> Any:
+        """
+        Solves `A x = b` for a `Vector` (the result is a vector) or for every
+        column of a `Matrix` (the result is a matrix of the solutions).
+        """
+
+        if self.singular:
+            raise ValueError("Matrix is singular.")
+        size = len(self.perm)
+        if isinstance(b, Vector):
+            if len(b._data) != size:
+                raise ValueError("Vector has incompatible dimension.")
+            if self.backend == "numpy":
+                return Vector._wrap(
+                    self._substitute_numpy(b._as_backend("numpy")), "numpy"
+                )
+            return Vector._wrap(
+                array("d", self._substitute(b._as_backend("python"))), "python"
+            )
+
+        if b.shape[0] != size:
+            raise ValueError(f"Matrices have incompatible dimension.")
+        b = b._as_backend(self.backend)
+        if self.backend == "numpy":
+            return Matrix._wrap(self._substitute_numpy(b._data), "numpy")
+        columns = [
+            self._substitute(column) for column in b.transpose()._rows()
+        ]
+        return Matrix._wrap(
+            array("d", chain.from_iterable(columns)),
+            "python",
+            (b.shape[1], size),
+        ).transpose()
+
+    def det(self) -> float:
+        """
+        Returns the determinant: the signed product of the pivots.
+        """
+
+        if self.singular:
+            return 0.0
+        result = float(self.sign)
+        for i in range(len(self.perm)):
+            result *= self.lu[i][i]
         return result
 
+    def inverse(self) -> Matrix:
+        """
+        Returns the inverse matrix, solving for every column of the identity.
+        """
+
+        size = len(self.perm)
+        identity = Matrix(
+            [
+                [1.0 if i == j else 0.0 for j in range(size)]
+                for i in range(size)
+            ],
+            backend=self.backend,
+            assume_valid=True,
+        )
+        return self.solve(identity)
+
+
+class VectorBatch:
+    """
+    A class to represent many vectors of the same dimension stored contiguously,
+    one vector per row of a `Matrix`. Pairwise operations over all vectors are
+    computed in one call by the matrix kernels of the backend instead of a
+    Python loop over `Vector` pairs.
+
+    Methods:
+    -------
+    `__len__() -> int`:
+        Returns the number of vectors in the batch.
+
+    `__getitem__(i: int) -> Vector`:
+        Returns the i-th vector.
+
+    `norms() -> List[float]`:
+        Returns the magnitudes (lengths) of all vectors.
+
+    `dot_product(batch_1: "VectorBatch", batch_2: "VectorBatch") -> Matrix`:
+        Static method to calculate the dot products of all pairs of vectors.
+
+    `angle_between_vectors(batch_1: "VectorBatch", batch_2: "VectorBatch") -> Matrix`:
+        Static method to calculate the angles (in radians) between all pairs of vectors.
+    """
+
+    def __init__(self, vectors: Any, backend: Optional[str] = None) -> None:
+        """
+        Initializes a VectorBatch object.
+
+        Args:
+            vectors (List[List[float]]): vectors of the same dimension, given as
+                lists, `Vector` objects or the rows of a 2D ndarray.
+            backend (Optional[str]): "python", "numpy" or None to pick NumPy
+                automatically when it is importable.
+        """
+
+        if isinstance(vectors, list) and vectors:
+            vectors = [
+                vector.get() if isinstance(vector, Vector) else vector
+                for vector in vectors
+            ]
+        self.vectors = Matrix(vectors, backend=backend)
+        self.backend = self.vectors.backend
+
+    def __len__(self) -> int:
+        """
+        Returns the number of vectors in the batch.
+        """
+
+        return self.vectors.shape[0]
+
+    @property
+    def dim(self) -> int:
+        """
+        The dimension of the vectors.
+        """
+
+        return self.vectors.shape[1]
+
+    def __getitem__(self, i: int) -> Vector:
+        """
+        Returns the i-th vector.
+        """
+
+        row = self.vectors.row(i)
+        if self.backend == "numpy":
+            return Vector._wrap(row._data[0].copy(), "numpy")
+        return Vector._wrap(array("d", next(row._rows())), "python")
+
+    def norms(self) -> List[float]:
+        """
+        Returns the magnitudes (lengths) of all vectors.
+        """
+
+        if self.backend == "numpy":
+            data = self.vectors._data
+            return np.sqrt(np.einsum("ij,ij->i", data, data)).tolist()
+        return [
+            math.sqrt(sum(map(mul, row, row))) for row in self.vectors._rows()
+        ]
+
     @staticmethod
-    def angle_between_vectors(vec_1: "Vector", vec_2: "Vector") -> float:
+    def dot_product(
+        batch_1: "VectorBatch", batch_2: Optional["VectorBatch"] = None
+    ) -> Matrix:
         """
-        Calculates the angle (in radians) between two vectors.
+        Calculates the dot products of all pairs of vectors: the element [i, j]
+        is the dot product of the i-th vector of `batch_1` and the j-th vector of
+        `batch_2` (or of `batch_1` itself, if `batch_2` is omitted).
         """
 
-        cos_a = Vector.dot_product(vec_1, vec_2) / (vec_1.len() * vec_2.len())
-        return math.acos(cos_a)
+        if batch_2 is None:
+            batch_2 = batch_1
+        if batch_1.dim != batch_2.dim:
+            raise ValueError("Vectors have incompatible dimension.")
+        return batch_1.vectors * batch_2.vectors.transpose()
+
+    @staticmethod
+    def angle_between_vectors(
+        batch_1: "VectorBatch", batch_2: Optional["VectorBatch"] = None
+    ) -> Matrix:
+        """
+        Calculates the angles (in radians) between all pairs of vectors, laid out
+        like `dot_product`. Cosines are clipped to [-1, 1] against rounding errors.
+        """
+
+        if batch_2 is None:
+            batch_2 = batch_1
+        dots = VectorBatch.dot_product(batch_1, batch_2)
+        norms_1, norms_2 = batch_1.norms(), batch_2.norms()
+        if not all(norms_1) or not all(norms_2):
+            raise ZeroDivisionError("Angle with a zero vector is undefined.")
+
+        if batch_1.backend == "numpy":
+            cosines = dots._data / np.outer(norms_1, norms_2)
+            return Matrix._wrap(
+                np.arccos(np.clip(cosines, -1.0, 1.0)), "numpy"
+            )
+
+        angles = array("d")
+        for norm_1, row in zip(norms_1, dots._rows()):
+            angles.extend(
+                [
+                    math.acos(max(-1.0, min(1.0, dot / (norm_1 * norm_2))))
+                    for dot, norm_2 in zip(row, norms_2)
+                ]
+            )
+        return Matrix._wrap(angles, "python", dots.shape)
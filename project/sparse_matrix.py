@@ -0,0 +1,311 @@
+from array import array
+from typing import Any, Iterable, List, Optional, Tuple
+
+from project.matrix_vector import Matrix, Vector
+
+
+class SparseMatrix:
+    """
+    A class to represent a sparse matrix in the CSR (compressed sparse row) form.
+    Only non-zero elements are stored, so the memory and the cost of the
+    operations scale with the number of non-zero elements (nnz) and not with
+    rows * columns.
+
+    The storage consists of three flat arrays: `values` and `indices` hold the
+    non-zero elements and their column numbers row by row, and `indptr[i]` is
+    the position in them where the i-th row starts.
+
+    Methods:
+    -------
+    `from_coo(rows, columns, values, shape) -> "SparseMatrix"`:
+        Builds a matrix from coordinate (COO) triplets, summing duplicates.
+
+    `from_dense(matrix: Matrix) -> "SparseMatrix"`:
+        Builds a sparse matrix from a dense one.
+
+    `to_coo() -> Tuple[List[int], List[int], List[float]]`:
+        Returns the coordinate (COO) triplets of the non-zero elements.
+
+    `to_dense(backend: Optional[str]) -> Matrix`:
+        Returns a dense matrix with the same elements.
+
+    `transpose() -> "SparseMatrix"`:
+        Returns the transpose of the matrix.
+
+    `__add__(other: Any) -> Any`:
+        Adds a sparse or a dense matrix.
+
+    `__mul__(other: Any) -> Any`:
+        Multiplies by a vector (SpMV), a dense matrix or a sparse matrix (SpMM).
+
+    `get() -> List[List[float]]`:
+        Returns a dense list representation of the matrix.
+    """
+
+    def __init__(self, matrix: List[List[float]]) -> None:
+        """
+        Initializes a SparseMatrix object from a dense 2D list.
+
+        Args:
+            matrix (List[List[float]]): a 2D list with the data.
+        """
+
+        if not Matrix.is_matrix(matrix):
+            raise TypeError("Input must be a valid matrix.")
+
+        self.shape = (len(matrix), len(matrix[0]))
+        self.values = array("d")
+        self.indices = array("q")
+        self.indptr = array("q", [0])
+        for row in matrix:
+            for column_num, value in enumerate(row):
+                if value:
+                    self.values.append(value)
+                    self.indices.append(column_num)
+            self.indptr.append(len(self.values))
+
+    @classmethod
+    def _wrap(
+        cls,
+        shape: Tuple[int, int],
+        values: array,
+        indices: array,
+        indptr: array,
+    ) -> "SparseMatrix":
+        """
+        Creates a matrix over existing CSR arrays without validating or copying them.
+        """
+
+        result = cls.__new__(cls)
+        result.shape = shape
+        result.values = values
+        result.indices = indices
+        result.indptr = indptr
+        return result
+
+    @classmethod
+    def from_coo(
+        cls,
+        rows: Iterable[int],
+        columns: Iterable[int],
+        values: Iterable[float],
+        shape: Tuple[int, int],
+    ) -> "SparseMatrix":
+        """
+        Builds a matrix from coordinate (COO) triplets. Duplicated coordinates are
+        summed, zeros are dropped.
+
+        Args:
+            rows (Iterable[int]): the row numbers of the elements.
+            columns (Iterable[int]): the column numbers of the elements.
+            values (Iterable[float]): the values of the elements.
+            shape (Tuple[int, int]): the number of rows and columns.
+
+        Returns:
+            result (SparseMatrix): the matrix in the CSR form.
+        """
+
+        count_rows, count_columns = shape
+        if count_rows <= 0 or count_columns <= 0:
+            raise TypeError("Input must be a valid matrix.")
+
+        row_dicts: List[dict] = [{} for _ in range(count_rows)]
+        for row_num, column_num, value in zip(rows, columns, values):
+            if not (
+                0 <= row_num < count_rows and 0 <= column_num < count_columns
+            ):
+                raise IndexError("Element is out of the matrix shape.")
+            row_dict = row_dicts[row_num]
+            row_dict[column_num] = row_dict.get(column_num, 0.0) + value
+        return cls._from_row_dicts(shape, row_dicts)
+
+    @classmethod
+    def _from_row_dicts(
+        cls, shape: Tuple[int, int], row_dicts: List[dict]
+    ) -> "SparseMatrix":
+        """
+        Builds a matrix from one {column: value} dictionary per row.
+        """
+
+        values = array("d")
+        indices = array("q")
+        indptr = array("q", [0])
+        for row_dict in row_dicts:
+            for column_num in sorted(row_dict):
+                value = row_dict[column_num]
+                if value:
+                    values.append(value)
+                    indices.append(column_num)
+            indptr.append(len(values))
+        return cls._wrap(shape, values, indices, indptr)
+
+    @classmethod
+    def from_dense(cls, matrix: Matrix) -> "SparseMatrix":
+        """
+        Builds a sparse matrix from a dense `Matrix`.
+        """
+
+        return cls(matrix.get())
+
+    @property
+    def nnz(self) -> int:
+        """
+        The number of stored (non-zero) elements.
+        """
+
+        return len(self.values)
+
+    def _row(self, row_num: int) -> Tuple[array, array]:
+        """
+        Returns the column numbers and the values of the non-zero elements of a row.
+        """
+
+        start, stop = self.indptr[row_num], self.indptr[row_num + 1]
+        return self.indices[start:stop], self.values[start:stop]
+
+    def to_coo(self) -> Tuple[List[int], List[int], List[float]]:
+        """
+        Returns the row numbers, the column numbers and the values of the
+        non-zero elements.
+        """
+
+        rows: List[int] = []
+        for row_num in range(self.shape[0]):
+            rows.extend(
+                [row_num] * (self.indptr[row_num + 1] - self.indptr[row_num])
+            )
+        return rows, self.indices.tolist(), self.values.tolist()
+
+    def to_dense(self, backend: Optional[str] = None) -> Matrix:
+        """
+        Returns a dense `Matrix` with the same elements.
+        """
+
+        return Matrix(self.get(), backend=backend, assume_valid=True)
+
+    def get(self) -> List[List[float]]:
+        """
+        Returns a dense list representation of the matrix.
+        """
+
+        dense = [[0.0] * self.shape[1] for _ in range(self.shape[0])]
+        for row_num, row in enumerate(dense):
+            for column_num, value in zip(*self._row(row_num)):
+                row[column_num] = value
+        return dense
+
+    def transpose(self) -> "SparseMatrix":
+        """
+        Transposes the matrix in O(nnz + rows + columns) with a counting sort
+        of the elements by their columns.
+        """
+
+        count_rows, count_columns = self.shape
+        indptr = array("q", bytes(8 * (count_columns + 1)))
+        for column_num in self.indices:
+            indptr[column_num + 1] += 1
+        for column_num in range(count_columns):
+            indptr[column_num + 1] += indptr[column_num]
+
+        position = indptr[:-1]
+        values = array("d", bytes(8 * self.nnz))
+        indices = array("q", bytes(8 * self.nnz))
+        for row_num in range(count_rows):
+            for column_num, value in zip(*self._row(row_num)):
+                target = position[column_num]
+                values[target] = value
+                indices[target] = row_num
+                position[column_num] = target + 1
+        return SparseMatrix._wrap(
+            (count_columns, count_rows), values, indices, indptr
+        )
+
+    def __add__(self, other: Any) -> Any:
+        """
+        Adds a sparse matrix (the result is sparse) or a dense `Matrix`
+        (the result is dense).
+        """
+
+        if self.shape != getattr(other, "shape", None):
+            raise ValueError("Matrix 'other' has wrong dimension.")
+        if isinstance(other, Matrix):
+            dense = other.get()
+            for row_num, row in enumerate(dense):
+                for column_num, value in zip(*self._row(row_num)):
+                    row[column_num] += value
+            return Matrix(dense, backend=other.backend, assume_valid=True)
+        if not isinstance(other, SparseMatrix):
+            return NotImplemented
+
+        row_dicts = []
+        for row_num in range(self.shape[0]):
+            row_dict = dict(zip(*self._row(row_num)))
+            for column_num, value in zip(*other._row(row_num)):
+                row_dict[column_num] = row_dict.get(column_num, 0.0) + value
+            row_dicts.append(row_dict)
+        return SparseMatrix._from_row_dicts(self.shape, row_dicts)
+
+    __radd__ = __add__
+
+    def __mul__(self, other: Any) -> Any:
+        """
+        Multiplies the matrix by a `Vector` (SpMV, the result is a vector),
+        a dense `Matrix` (the result is dense) or a `SparseMatrix`
+        (Gustavson's SpMM, the result is sparse).
+        """
+
+        if isinstance(other, Vector):
+            vector = other.get()
+            if self.shape[1] != len(vector):
+                raise ValueError("Vector has incompatible dimension.")
+            result = [
+                sum(
+                    value * vector[column_num]
+                    for column_num, value in zip(*self._row(i))
+                )
+                for i in range(self.shape[0])
+            ]
+            return Vector(result, backend=other.backend)
+
+        if self.shape[1] != getattr(other, "shape", (None, None))[0]:
+            raise ValueError(f"Matrices can't be multiplied.")
+
+        if isinstance(other, Matrix):
+            other_rows = other.get()
+            count_columns = other.shape[1]
+            dense = []
+            for row_num in range(self.shape[0]):
+                accumulator = [0.0] * count_columns
+                for inner_num, value in zip(*self._row(row_num)):
+                    other_row = other_rows[inner_num]
+                    for column_num in range(count_columns):
+                        accumulator[column_num] += (
+                            value * other_row[column_num]
+                        )
+                dense.append(accumulator)
+            return Matrix(dense, backend=other.backend, assume_valid=True)
+
+        if not isinstance(other, SparseMatrix):
+            return NotImplemented
+
+        row_dicts = []
+        for row_num in range(self.shape[0]):
+            row_dict: dict = {}
+            for inner_num, value in zip(*self._row(row_num)):
+                for column_num, other_value in zip(*other._row(inner_num)):
+                    row_dict[column_num] = (
+                        row_dict.get(column_num, 0.0) + value * other_value
+                    )
+            row_dicts.append(row_dict)
+        return SparseMatrix._from_row_dicts(
+            (self.shape[0], other.shape[1]), row_dicts
+        )
+
+    def __rmul__(self, other: Any) -> Any:
+        """
+        Multiplies a dense `Matrix` by the sparse matrix: `A * S = (S^T * A^T)^T`.
+        """
+
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return (self.transpose() * other.transpose()).transpose()
@@ -0,0 +1,162 @@
+"""
+Benchmarks the core `Matrix` and `Vector` operations and writes JSON results.
+
+The suite times `Matrix.__add__`, `transpose`, `__mul__`, `Vector.dot_product`,
+`len` and `angle_between_vectors` for every backend and size, on square
+(n x n) and skinny (n x 8) matrices. Every record holds the best time per
+call, the floating point operations per second and the peak memory allocated
+by one call (measured by `tracemalloc` in a separate, untimed run). Cases
+above `--max-flops` are skipped, so the pure Python backend does not spend
+hours on 2048 x 2048 products.
+
+    python scripts/benchmark_matrix_vector.py --sizes 2 64 2048 \
+        --output benchmarks/matrix_vector.json
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from random import Random
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project.matrix_vector import BACKENDS, HAS_NUMPY, Matrix, Vector
+
+SIZES = [2, 8, 32, 128, 512, 2048]
+SKINNY_COLUMNS = 8
+
+
+def best(statement, min_time: float, repeat: int) -> tuple:
+    """Returns the best time of one call in seconds and the calls per run."""
+    timer = timeit.Timer(statement)
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    times = timer.repeat(number=number, repeat=repeat)
+    return min(times) / number, number
+
+
+def peak_memory(statement) -> int:
+    """Returns the peak number of bytes allocated by one call."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        result = statement()
+        _, peak = tracemalloc.get_traced_memory()
+        del result
+    finally:
+        tracemalloc.stop()
+    return peak - start
+
+
+def cases(backend: str, size: int, random: Random):
+    """Yields (operation, shape, statement, flops) for one backend and size."""
+    for shape, columns in ("square", size), ("skinny", SKINNY_COLUMNS):
+        if shape == "skinny" and size <= SKINNY_COLUMNS:
+            continue
+        a = Matrix(
+            [[random.random() for _ in range(columns)] for _ in range(size)],
+            backend=backend,
+        )
+        b = Matrix(
+            [[random.random() for _ in range(columns)] for _ in range(size)],
+            backend=backend,
+        )
+        c = Matrix(
+            [
+                [random.random() for _ in range(columns)]
+                for _ in range(columns)
+            ],
+            backend=backend,
+        )
+        label = f"{size}x{columns}"
+        yield "add", label, lambda: a + b, size * columns
+        yield "transpose", label, lambda: a.transpose(), 0
+        yield "mul", label, lambda: a * c, 2 * size * columns * columns
+
+    u = Vector([random.random() for _ in range(size)], backend=backend)
+    v = Vector([random.random() for _ in range(size)], backend=backend)
+    label = str(size)
+    yield "dot_product", label, lambda: Vector.dot_product(u, v), 2 * size
+    yield "len", label, lambda: u.len(), 2 * size
+    yield "angle_between_vectors", label, (
+        lambda: Vector.angle_between_vectors(u, v)
+    ), 6 * size
+
+
+def run(arguments) -> dict:
+    """Runs every case and returns the JSON document."""
+    random = Random(arguments.seed)
+    results = []
+    for backend in arguments.backend:
+        for size in arguments.sizes:
+            for operation, shape, statement, flops in cases(
+                backend, size, random
+            ):
+                record = {
+                    "backend": backend,
+                    "operation": operation,
+                    "shape": shape,
+                    "flops": flops,
+                }
+                if flops > arguments.max_flops:
+                    record["skipped"] = True
+                    results.append(record)
+                    continue
+                seconds, number = best(
+                    statement, arguments.min_time, arguments.repeat
+                )
+                record.update(
+                    seconds=seconds,
+                    number=number,
+                    flops_per_second=flops / seconds if flops else None,
+                    peak_bytes=peak_memory(statement),
+                )
+                results.append(record)
+                if not arguments.quiet:
+                    print(
+                        f"{backend:>6} {operation:<22}{shape:>10}"
+                        f"{seconds * 1e6:>14.2f} us"
+                        f"{(flops / seconds if flops else 0) / 1e6:>12.1f} MFLOP/s"
+                        f"{record['peak_bytes']:>12} B",
+                        file=sys.stderr,
+                    )
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": __import__("numpy").__version__ if HAS_NUMPY else None,
+        "results": results,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=BACKENDS, action="append")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--max-flops", type=float, default=1e9)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file, stdout by default")
+    parser.add_argument("--quiet", action="store_true")
+    arguments = parser.parse_args()
+    arguments.backend = arguments.backend or (
+        ["python", "numpy"] if HAS_NUMPY else ["python"]
+    )
+
+    document = run(arguments)
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump(document, file, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Measures the validation overhead removed from small-matrix arithmetic.
+
+For every size the script compares:
+* `Matrix(rows)` with `Matrix(rows, assume_valid=True)`;
+* `+`, `*` and `transpose()`, whose results are built by the trusted
+  constructor, with the same operations followed by a validating rebuild
+  `Matrix(result.get())`, which is what every operation used to pay.
+
+    python scripts/benchmark_validation.py --backend python --sizes 2 4 8
+"""
+
+import argparse
+import sys
+import timeit
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project.matrix_vector import BACKENDS, DEFAULT_BACKEND, Matrix
+
+
+def best(statement, number: int) -> float:
+    """Returns the best time of one call in microseconds."""
+    times = timeit.repeat(statement, number=number, repeat=5)
+    return min(times) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 4, 8, 16])
+    parser.add_argument("--number", type=int, default=2000)
+    arguments = parser.parse_args()
+
+    print(f"backend: {arguments.backend}, times in microseconds per call")
+    print(f"{'case':<24}{'validated':>12}{'trusted':>12}{'saved':>10}")
+    for size in arguments.sizes:
+        rows = [
+            [float(i * size + j) for j in range(size)] for i in range(size)
+        ]
+        matrix = Matrix(rows, backend=arguments.backend)
+        cases = {
+            "construct": (
+                lambda: Matrix(rows, backend=arguments.backend),
+                lambda: Matrix(
+                    rows, backend=arguments.backend, assume_valid=True
+                ),
+            ),
+            "add": (
+                lambda: Matrix((matrix + matrix).get(), arguments.backend),
+                lambda: matrix + matrix,
+            ),
+            "mul": (
+                lambda: Matrix((matrix * matrix).get(), arguments.backend),
+                lambda: matrix * matrix,
+            ),
+            "transpose": (
+                lambda: Matrix(matrix.transpose().get(), arguments.backend),
+                lambda: matrix.transpose(),
+            ),
+        }
+        for name, (validated, trusted) in cases.items():
+            validated_time = best(validated, arguments.number)
+            trusted_time = best(trusted, arguments.number)
+            saved = 1 - trusted_time / validated_time
+            print(
+                f"{name + f' {size}x{size}':<24}"
+                f"{validated_time:>12.2f}{trusted_time:>12.2f}{saved:>10.0%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
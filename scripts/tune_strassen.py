@@ -0,0 +1,73 @@
+"""
+Finds the Strassen crossover size for `Matrix.__mul__` on this machine.
+
+For every backend the script multiplies random square matrices with several
+candidate crossovers and reports the fastest one. The result is applied by
+exporting `MATRIX_STRASSEN_CROSSOVER_<BACKEND>` before importing the module:
+
+    python scripts/tune_strassen.py --sizes 256 512 --repeat 3
+"""
+
+import argparse
+import random
+import sys
+import timeit
+
+import shared
+
+sys.path.insert(0, str(shared.ROOT))
+
+from project.matrix_vector import (
+    BACKENDS,
+    HAS_NUMPY,
+    STRASSEN_CROSSOVER,
+    Matrix,
+)
+
+CANDIDATES = {
+    "python": [16, 32, 64, 128, 256, 512],
+    "numpy": [256, 512, 1024, 2048, 4096],
+}
+
+
+def measure(backend: str, size: int, crossover: int, repeat: int) -> float:
+    """Returns the best time of multiplying two random size x size matrices."""
+    data = [[random.random() for _ in range(size)] for _ in range(size)]
+    matrix = Matrix(data, backend=backend)
+    STRASSEN_CROSSOVER[backend] = crossover
+    return min(timeit.repeat(lambda: matrix * matrix, number=1, repeat=repeat))
+
+
+def tune(backend: str, sizes: list, repeat: int) -> int:
+    """Returns the crossover with the smallest total time over all sizes."""
+    totals = {}
+    for crossover in CANDIDATES[backend]:
+        times = [measure(backend, size, crossover, repeat) for size in sizes]
+        totals[crossover] = sum(times)
+        print(
+            f"{backend:>6} crossover={crossover:<5}"
+            + "".join(f" n={s}: {t:.3f}s" for s, t in zip(sizes, times))
+        )
+    return min(totals, key=lambda crossover: totals[crossover])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backend", choices=BACKENDS, action="append")
+    parser.add_argument("--sizes", type=int, nargs="+")
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    backends = arguments.backend or (
+        ["python", "numpy"] if HAS_NUMPY else ["python"]
+    )
+    for backend in backends:
+        sizes = arguments.sizes or (
+            [256, 512] if backend == "python" else [2048, 4096]
+        )
+        best = tune(backend, sizes, arguments.repeat)
+        print(f"export MATRIX_STRASSEN_CROSSOVER_{backend.upper()}={best}")
+
+
+if __name__ == "__main__":
+    main()
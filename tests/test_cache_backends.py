@@ -0,0 +1,177 @@
+import multiprocessing
+import pytest
+from typing import Any
+from project import cache_backends
+from project.cache_backends import (
+    SQLiteBackend,
+    SharedMemoryBackend,
+    key_bytes,
+)
+from project.decorators import MISSING, cache_decorator, make_key
+
+
+def store_squares(path: str, start: int) -> None:
+    backend = SQLiteBackend(path)
+    for x in range(start, start + 10):
+        backend.set((x,), x * x)
+
+
+def compute_shared_squares(path: str, start: int) -> None:
+    square = cache_decorator(
+        lambda x: x * x, backend=SharedMemoryBackend(path)
+    )
+    for x in range(start, start + 50):
+        square(x)
+
+
+def test_key_bytes() -> None:
+    key = make_key(({"a": 1, "b": [2, 3]},), {"c": {"x", "y"}}, typed=True)
+    same = make_key(({"b": [2, 3], "a": 1},), {"c": {"y", "x"}}, typed=True)
+    assert key_bytes(key) == key_bytes(same)
+    assert key_bytes((1,)) != key_bytes((1.0,))
+    assert key_bytes(("ab", "c")) != key_bytes(("a", "bc"))
+
+
+def test_sqlite_backend(tmp_path: Any) -> None:
+    backend = SQLiteBackend(str(tmp_path / "cache.db"))
+    assert backend.get((1,)) is MISSING
+    backend.set((1,), {"value": [1, 2]})
+    assert backend.get((1,)) == {"value": [1, 2]}
+    backend.set((1,), "new")
+    assert backend.get((1,)) == "new" and len(backend) == 1
+    backend.delete((1,))
+    assert backend.get((1,)) is MISSING
+    backend.set((2,), 2)
+    backend.clear()
+    assert len(backend) == 0
+
+
+def test_sqlite_backend_limits(tmp_path: Any, monkeypatch: Any) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(cache_backends.time, "time", lambda: now[0])
+    backend = SQLiteBackend(str(tmp_path / "cache.db"), max_entries=3)
+    for x in range(3):
+        backend.set((x,), x)
+        now[0] += 1
+    backend.get((0,))
+    now[0] += 1
+    backend.set((3,), 3)
+    # The least recently read entry is evicted
+    assert backend.get((1,)) is MISSING
+    assert [backend.get((x,)) for x in (0, 2, 3)] == [0, 2, 3]
+
+    backend.set((4,), 4, ttl=10)
+    now[0] += 11
+    assert backend.get((4,)) is MISSING
+
+    backend = SQLiteBackend(str(tmp_path / "bytes.db"), max_bytes=3000)
+    for x in range(5):
+        backend.set((x,), bytes(1000))
+        now[0] += 1
+    assert len(backend) == 2
+    backend.set(("large",), bytes(5000))
+    assert backend.get(("large",)) is MISSING
+
+
+def test_cache_decorator_with_backend(tmp_path: Any) -> None:
+    path = str(tmp_path / "cache.db")
+    calls = []
+
+    def square(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    cached: Any = cache_decorator(
+        square, cache_size=2, backend=SQLiteBackend(path)
+    )
+    assert [cached(x) for x in [1, 2, 3, 1]] == [1, 4, 9, 1]
+    # 1 was evicted from the memory tier but found on disk
+    assert calls == [1, 2, 3]
+    assert cached.cache_info().hits == 1
+
+    # A restarted process finds the results on disk
+    restarted = cache_decorator(square, backend=SQLiteBackend(path))
+    assert restarted(3) == 9 and calls == [1, 2, 3]
+
+
+def test_sqlite_backend_between_processes(tmp_path: Any) -> None:
+    path = str(tmp_path / "cache.db")
+    backend = SQLiteBackend(path)
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=store_squares, args=(path, start))
+        for start in (0, 10)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    assert [backend.get((x,)) for x in range(20)] == [x * x for x in range(20)]
+
+
+def test_shared_memory_backend(tmp_path: Any) -> None:
+    backend = SharedMemoryBackend(str(tmp_path / "cache"), entries=64)
+    assert backend.get((1,)) is MISSING
+    backend.set((1,), {"value": [1, 2]})
+    assert backend.get((1,)) == {"value": [1, 2]}
+    backend.set((1,), "new")
+    assert backend.get((1,)) == "new" and len(backend) == 1
+    backend.delete((1,))
+    assert backend.get((1,)) is MISSING
+
+    # Values larger than a slot are not cached
+    backend.set((2,), bytes(2000))
+    assert backend.get((2,)) is MISSING
+    backend.set((3,), 3)
+    backend.clear()
+    assert len(backend) == 0
+
+    # Another mapping of the file sees the same entries and layout
+    backend.set(("shared",), 42)
+    other = SharedMemoryBackend(str(tmp_path / "cache"), entries=8)
+    assert other.get(("shared",)) == 42 and other.groups == backend.groups
+    other.close()
+    backend.close()
+
+
+def test_shared_memory_backend_eviction(
+    tmp_path: Any, monkeypatch: Any
+) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(cache_backends.time, "time", lambda: now[0])
+    # A single group of two slots
+    backend = SharedMemoryBackend(str(tmp_path / "cache"), entries=2, ways=2)
+    backend.set((1,), 1)
+    now[0] += 1
+    backend.set((2,), 2)
+    now[0] += 1
+    backend.get((1,))
+    now[0] += 1
+    backend.set((3,), 3)
+    assert backend.get((2,)) is MISSING
+    assert backend.get((1,)) == 1 and backend.get((3,)) == 3
+
+    backend.set((4,), 4, ttl=5)
+    now[0] += 6
+    assert backend.get((4,)) is MISSING
+    assert len(backend) == 1
+
+
+def test_shared_memory_backend_between_processes(tmp_path: Any) -> None:
+    path = str(tmp_path / "cache")
+    backend = SharedMemoryBackend(path, entries=1024)
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=compute_shared_squares, args=(path, start))
+        for start in (0, 25, 50)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+    assert len(backend) == 100
+    assert [backend.get((x,)) for x in range(100)] == [
+        x * x for x in range(100)
+    ]
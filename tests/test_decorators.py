@@ -1,6 +1,22 @@
 import pytest
 from unittest.mock import patch, call
-from project.decorators import cache_decorator, smart_args, Evaluated, Isolated
+from project import decorators
+from project.decorators import (
+    cache_decorator,
+    cache_report,
+    estimate_size,
+    make_key,
+    smart_args,
+    Evaluated,
+    Isolated,
+)
+from array import array
+import asyncio
+import pickle
+from threading import Event, Thread
+from typing import List
+import time
+from project.thread_pool import ThreadPool
 from typing import Any
 import random
 from itertools import count
@@ -79,6 +95,431 @@ def test_without_cache() -> None:
         fibonacci(900)
 
 
+def test_cache_info() -> None:
+    square: Any = cache_decorator(lambda x: x * x, cache_size=2)
+    for x in [1, 2, 1, 3, 1]:
+        square(x)
+    assert square.cache_info() == (1, 4, 2, 2, 2)
+
+    with pytest.raises(ValueError):
+        cache_decorator(print, cache_size=2, policy="random")
+
+
+@pytest.mark.parametrize("policy", ["lru", "lfu", "arc"])
+def test_cache_keeps_hot_key(policy: str) -> None:
+    calls = []
+
+    @cache_decorator(cache_size=3, policy=policy)
+    def identity(x: int) -> int:
+        calls.append(x)
+        return x
+
+    # The hot key 0 is inserted first, FIFO would evict it after three misses
+    for x in range(1, 100):
+        assert identity(0) == 0
+        assert identity(x) == x
+    assert calls.count(0) == 1
+    assert len(identity.dict_cache) == 3
+    assert identity.cache_info().evictions == 97
+
+
+def test_cache_fifo_evicts_hot_key() -> None:
+    calls = []
+
+    @cache_decorator(cache_size=3, policy="fifo")
+    def identity(x: int) -> int:
+        calls.append(x)
+        return x
+
+    for x in range(1, 10):
+        identity(0)
+        identity(x)
+    assert calls.count(0) > 1
+
+
+def test_cache_lfu_and_arc_resist_scan() -> None:
+    for policy in ["lfu", "arc"]:
+        calls = []
+
+        @cache_decorator(cache_size=4, policy=policy)
+        def identity(x: int) -> int:
+            calls.append(x)
+            return x
+
+        # Two frequently used keys survive a long scan of keys used once
+        for _ in range(3):
+            identity(-1)
+            identity(-2)
+        for x in range(1000):
+            identity(x)
+        identity(-1)
+        identity(-2)
+        assert calls.count(-1) == 1 and calls.count(-2) == 1, policy
+
+
+def test_cache_ttl(monkeypatch: Any) -> None:
+    now = [0.0]
+    monkeypatch.setattr(decorators, "monotonic", lambda: now[0])
+    calls = []
+
+    @cache_decorator(ttl=10)
+    def identity(x: int) -> int:
+        calls.append(x)
+        return x
+
+    identity(1)
+    now[0] = 5
+    identity(2)
+    identity(1)
+    assert calls == [1, 2]
+
+    # Lazy expiry on lookup
+    now[0] = 11
+    identity(1)
+    assert calls == [1, 2, 1]
+
+    # Periodic expiry drops the stale key 2 on the next miss
+    now[0] = 16
+    identity(3)
+    assert list(identity.dict_cache) == [(1,), (3,)]
+    assert identity.cache_info().evictions == 2
+
+
+def test_cache_max_bytes() -> None:
+    @cache_decorator(max_bytes=100, sizeof=len, policy="lru")
+    def blob(size: int) -> bytes:
+        return bytes(size)
+
+    blob(40)
+    blob(50)
+    blob(40)
+    blob(30)
+    # 50 is the least recently used entry and is evicted to fit 30 bytes
+    assert list(blob.dict_cache) == [(40,), (30,)]
+    blob(1000)
+    assert (1000,) not in blob.dict_cache
+    assert blob.cache_info().evictions == 1
+
+
+def test_estimate_size() -> None:
+    shared = list(range(100))
+    assert estimate_size([shared, shared]) < 2 * estimate_size(shared)
+    assert estimate_size(bytes(1000)) > 1000
+    assert estimate_size({"a": "x" * 1000}) > 1000
+    assert estimate_size(array("d", [0.0] * 1000)) > 8000
+
+
+def test_make_key() -> None:
+    # Hashable arguments are used as they are
+    args = (1, "a", (2, 3))
+    assert make_key(args, {}) is args
+    assert make_key((999,), {}) == (999,)
+
+    # Dicts with keys that cannot be sorted
+    assert make_key(({1: [2], "a": 3},), {}) == make_key(
+        ({"a": 3, 1: [2]},), {}
+    )
+    assert make_key(({3, 1, 2},), {}) == make_key(({1, 2, 3},), {})
+
+    # Keyword arguments do not collide with positional ones
+    assert make_key((1,), {"b": 2}) != make_key((1, ("b", 2)), {})
+    assert make_key((), {"a": 1, "b": [2]}) == make_key((), {"b": [2], "a": 1})
+
+    assert make_key(([1],), {}) == make_key(((1,),), {})
+    assert make_key(([1],), {}, typed=True) != make_key(
+        ((1,),), {}, typed=True
+    )
+    assert make_key((1,), {}, typed=True) != make_key((1.0,), {}, typed=True)
+    assert make_key(([[1]],), {}, typed=True) != make_key(
+        ([(1,)],), {}, typed=True
+    )
+
+
+def test_cache_typed_and_key_function() -> None:
+    calls = []
+
+    @cache_decorator(cache_size=4, typed=True)
+    def describe(value: Any) -> str:
+        calls.append(value)
+        return repr(value)
+
+    assert describe([1]) == "[1]"
+    assert describe((1,)) == "(1,)"
+    assert describe(1) == "1" and describe(1.0) == "1.0"
+    assert len(calls) == 4
+
+    @cache_decorator(cache_size=4, key=lambda text, **_: text.lower())
+    def shout(text: str, repeat: int = 1) -> str:
+        calls.append(text)
+        return text.upper()
+
+    assert shout("Hello") == shout("HELLO", repeat=2) == "HELLO"
+    assert list(shout.dict_cache) == ["hello"]
+
+
+def test_cache_single_flight() -> None:
+    calls = []
+    release = Event()
+
+    @cache_decorator(cache_size=4, thread_safe=True)
+    def slow_square(x: int) -> int:
+        calls.append(x)
+        release.wait(5)
+        return x * x
+
+    results: List[int] = []
+    threads = [
+        Thread(target=lambda: results.append(slow_square(3))) for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    # Let all threads reach the cache before the computation finishes
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [3]
+    assert results == [9] * 8
+    info = slow_square.cache_info()
+    assert info.hits + info.misses == 8 and info.currsize == 1
+
+
+def test_cache_single_flight_error() -> None:
+    calls = []
+
+    @cache_decorator(cache_size=4, thread_safe=True)
+    def fail(x: int) -> int:
+        calls.append(x)
+        time.sleep(0.05)
+        raise ValueError(x)
+
+    errors: List[Exception] = []
+
+    def call() -> None:
+        try:
+            fail(1)
+        except ValueError as error:
+            errors.append(error)
+
+    threads = [Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 4
+    # Failures are not cached
+    with pytest.raises(ValueError):
+        fail(1)
+    assert len(calls) >= 2
+
+
+def test_cache_thread_safe_pool() -> None:
+    @cache_decorator(cache_size=8, policy="lru", thread_safe=True)
+    def square(x: int) -> int:
+        return x * x
+
+    pool = ThreadPool(4)
+    tasks = [pool.enqueue(square, i % 20) for i in range(400)]
+    assert [task.get_res() for task in tasks] == [
+        (i % 20) ** 2 for i in range(400)
+    ]
+    pool.dispose()
+    info = square.cache_info()
+    assert info.hits + info.misses == 400 and info.currsize == 8
+
+
+def test_cache_coroutine_function() -> None:
+    calls = []
+
+    @cache_decorator(cache_size=4)
+    async def fetch(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        return x * 10
+
+    async def main() -> None:
+        # Concurrent awaiters share one call
+        assert await asyncio.gather(*[fetch(1) for _ in range(5)]) == [10] * 5
+        assert await fetch(1) == 10
+        assert await fetch(2) == 20
+
+    asyncio.run(main())
+    assert calls == [1, 2]
+    # The cache survives the event loop
+    assert asyncio.run(fetch(1)) == 10 and calls == [1, 2]
+
+
+def test_cache_coroutine_failure_and_cancel() -> None:
+    calls = []
+
+    @cache_decorator(cache_size=4)
+    async def flaky(x: int) -> int:
+        calls.append(x)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            raise ConnectionError(x)
+        return x
+
+    async def main() -> None:
+        results = await asyncio.gather(
+            flaky(1), flaky(1), return_exceptions=True
+        )
+        assert all(isinstance(r, ConnectionError) for r in results)
+        # The failure was not cached
+        assert await flaky(1) == 1
+        assert len(calls) == 2
+
+        # Cancelling one awaiter does not cancel the shared call
+        first = asyncio.ensure_future(flaky(2))
+        second = asyncio.ensure_future(flaky(2))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 2
+        assert first.cancelled() and calls == [1, 1, 2]
+
+    asyncio.run(main())
+
+
+def test_cache_stats_and_metrics(monkeypatch: Any) -> None:
+    clock = [0.0]
+    monkeypatch.setattr(decorators, "perf_counter", lambda: clock[0])
+    events = []
+
+    @cache_decorator(
+        cache_size=2,
+        policy="lru",
+        metrics=lambda event, key, seconds: events.append(
+            (event, key, seconds)
+        ),
+    )
+    def slow(x: int) -> int:
+        clock[0] += x
+        return x
+
+    for x in [1, 2, 1, 3, 2, 1]:
+        slow(x)
+    stats = slow.cache_stats()
+    assert (stats.hits, stats.misses, stats.evictions) == (1, 5, 3)
+    assert stats.miss_time == 1 + 2 + 3 + 2 + 1
+    assert stats.mean_miss_latency == 9 / 5
+    assert stats.time_saved == 1
+    # 2 and 1 were evicted shortly before they were needed again
+    assert stats.ghost_hits == 2
+    assert stats.peak_size == 2 and stats.hit_rate == 1 / 6
+    assert events[:4] == [
+        ("miss", (1,), 1),
+        ("miss", (2,), 2),
+        ("hit", (1,), 1),
+        ("evict", (2,), 0.0),
+    ]
+
+
+def test_cache_report() -> None:
+    @cache_decorator(cache_size=4)
+    def report_fast(x: int) -> int:
+        return x
+
+    @cache_decorator(cache_size=4)
+    def report_slow(x: int) -> int:
+        time.sleep(0.01)
+        return x
+
+    for _ in range(3):
+        report_fast(1)
+        report_slow(1)
+    lines = cache_report().splitlines()
+    rank = {
+        name: i
+        for i, line in enumerate(lines)
+        for name in ["report_slow", "report_fast"]
+        if name in line
+    }
+    assert rank["report_slow"] < rank["report_fast"]
+    assert len(cache_report(top=1).splitlines()) == 2
+
+
+def test_cache_invalidate_and_clear(tmp_path: Any) -> None:
+    calls = []
+
+    @cache_decorator(cache_size=4)
+    def power(x: int, exponent: int = 2) -> int:
+        calls.append(x)
+        return x**exponent
+
+    power(2)
+    power(2, exponent=3)
+    assert power.cache_invalidate(2)
+    assert not power.cache_invalidate(2)
+    assert len(power.dict_cache) == 1
+    power(2)
+    power(2, exponent=3)
+    assert calls == [2, 2, 2]
+
+    power.cache_clear()
+    assert len(power.dict_cache) == 0
+    assert power.cache_info() == (0, 0, 0, 4, 0)
+
+
+def test_cache_prefill() -> None:
+    calls = []
+
+    @cache_decorator(cache_size=8, thread_safe=True)
+    def add(x: int, y: int = 0) -> int:
+        calls.append(x)
+        return x + y
+
+    assert add.cache_prefill([1, (2,), (3, 10)]) == [1, 2, 13]
+    pool = ThreadPool(2)
+    assert add.cache_prefill(range(4, 8), pool=pool, y=1) == [5, 6, 7, 8]
+    pool.dispose()
+    calls.clear()
+    assert [add(1), add(3, 10), add(5, y=1)] == [1, 13, 6]
+    assert calls == []
+
+    plain = cache_decorator(lambda x: x, cache_size=2)
+    with pytest.raises(ValueError):
+        plain.cache_prefill([1], pool=ThreadPool(1))
+
+    @cache_decorator(cache_size=2)
+    async def fetch(x: int) -> int:
+        return x
+
+    assert asyncio.run(fetch.cache_prefill([1, 2])) == [1, 2]
+    assert list(fetch.dict_cache) == [(1,), (2,)]
+
+
+def test_cache_snapshot_restore(monkeypatch: Any) -> None:
+    now = [0.0]
+    monkeypatch.setattr(decorators, "monotonic", lambda: now[0])
+
+    @cache_decorator(cache_size=3, policy="lru", ttl=100)
+    def square(x: int) -> int:
+        return x * x
+
+    square(1)
+    now[0] = 50
+    square(2)
+    square(1)
+    snapshot = pickle.loads(pickle.dumps(square.cache_snapshot()))
+    assert [entry[:2] for entry in snapshot] == [((2,), 4), ((1,), 1)]
+
+    calls = []
+
+    @cache_decorator(cache_size=3, policy="lru", ttl=100)
+    def restarted(x: int) -> int:
+        calls.append(x)
+        return x * x
+
+    now[0] = 1000
+    restarted.cache_restore(snapshot)
+    assert list(restarted.dict_cache) == [(2,), (1,)]
+    now[0] = 1060
+    # 1 had 50 seconds to live when the snapshot was taken
+    assert restarted(2) == 4 and restarted(1) == 1
+    assert calls == [1]
+
+
 def get_random_number() -> int:
     return random.randint(0, 100)
 
@@ -0,0 +1,76 @@
+import pytest
+
+from project.lazy_matrix import LazyMatrix
+from project.matrix_vector import HAS_NUMPY, Matrix, chain_order
+
+BACKENDS = ["python", "numpy"] if HAS_NUMPY else ["python"]
+
+
+@pytest.fixture(params=BACKENDS)
+def matrices(request: pytest.FixtureRequest) -> tuple:
+    """Three matrices with compatible shapes: 2x3, 2x3 and 2x3."""
+    backend = request.param
+    a = Matrix([[1, 2, 3], [4, 5, 6]], backend=backend)
+    b = Matrix([[0, 1, 0], [1, 0, 1]], backend=backend)
+    c = Matrix([[2, 2, 2], [1, 1, 1]], backend=backend)
+    return a, b, c
+
+
+def test_building_is_lazy(matrices: tuple) -> None:
+    a, b, c = matrices
+    expression = (a.lazy() + b) * c.transpose()
+    assert isinstance(expression, LazyMatrix)
+    assert expression.shape == (2, 2)
+    assert expression.operation == "mul"
+
+    with pytest.raises(ValueError):
+        a.lazy() * b
+    with pytest.raises(ValueError):
+        a.lazy() + c.transpose()
+
+
+def test_evaluation_matches_eager(matrices: tuple) -> None:
+    a, b, c = matrices
+    expression = (a.lazy() + b) * c.transpose()
+    assert expression.get() == ((a + b) * c.transpose()).get()
+
+    expression = (a.lazy() + b + c).transpose() * a
+    assert expression.get() == ((a + b + c).transpose() * a).get()
+
+    expression = a + (b.lazy() * c.transpose()).transpose().transpose() * a
+    assert expression.get() == (a + b * c.transpose() * a).get()
+
+
+def test_transposes_are_pushed_to_leaves(matrices: tuple) -> None:
+    a, b, _ = matrices
+    tree = (a.lazy() * b.transpose()).transpose()._push_transposes()
+    assert tree.operation == "mul"
+    left, right = tree.operands
+    assert left.operation == right.operation == "leaf"
+    assert left.matrix is not None and right.matrix is not None
+    assert left.matrix.get() == b.get()
+    assert right.matrix.get() == a.transpose().get()
+
+
+def test_chain_is_flattened(matrices: tuple) -> None:
+    a, b, c = matrices
+    expression = a.lazy() * (b.lazy().transpose() * (c.lazy() * a.transpose()))
+    assert len(expression._flatten()) == 4
+    assert expression.get() == (a * b.transpose() * c * a.transpose()).get()
+
+    expression = a.lazy() + (b.lazy() + (c.lazy() + a))
+    assert len(expression._flatten()) == 4
+    assert expression.get() == (a + b + c + a).get()
+
+
+@pytest.mark.parametrize(
+    "dims,cost,plan",
+    [
+        ([2, 3], 0, 0),
+        ([10, 30, 5, 60], 4500, ((0, 1), 2)),
+        ([40, 20, 30, 10, 30], 26000, ((0, (1, 2)), 3)),
+        ([10, 20, 30, 40, 30], 30000, (((0, 1), 2), 3)),
+    ],
+)
+def test_chain_order(dims: list, cost: int, plan: object) -> None:
+    assert chain_order(dims) == (cost, plan)
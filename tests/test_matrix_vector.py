@@ -1,7 +1,22 @@
 import pytest
-from math import isclose, sqrt
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import math
+from math import isclose, pi, sqrt
+from random import Random
+from typing import Any
 
-from project.matrix_vector import Matrix, Vector
+from project.matrix_vector import (
+    DEFAULT_BACKEND,
+    HAS_NUMPY,
+    STRASSEN_CROSSOVER,
+    Matrix,
+    Vector,
+    VectorBatch,
+    chain_order,
+    strassen_size,
+)
+from project.thread_pool import ThreadPool
 
 
 class TestMatrixOperations:
@@ -118,3 +133,623 @@ class TestVectorOperations:
         # 1x1 vector (a single value)
         vector = Vector([5])
         assert isclose(vector.len(), 5)
+
+
+AVAILABLE_BACKENDS = ["python", "numpy"] if HAS_NUMPY else ["python"]
+
+
+class TestBackends:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_matrix_operations(self, backend: str) -> None:
+        matrix1 = Matrix([[1, 2], [3, 4], [5, 6]], backend=backend)
+        matrix2 = Matrix([[1, 0, 2], [0, 1, 3]], backend=backend)
+        assert matrix1.backend == backend
+        assert (matrix1 + matrix1).get() == [[2, 4], [6, 8], [10, 12]]
+        assert matrix1.transpose().get() == [[1, 3, 5], [2, 4, 6]]
+        assert (matrix1 * matrix2).get() == [
+            [1, 2, 8],
+            [3, 4, 18],
+            [5, 6, 28],
+        ]
+        with pytest.raises(ValueError):
+            matrix1 * matrix1
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_vector_operations(self, backend: str) -> None:
+        vector1 = Vector([3, 4], backend=backend)
+        vector2 = Vector([4, -3], backend=backend)
+        assert (vector1 + vector2).get() == [7, 1]
+        assert vector1.len() == 5
+        assert Vector.dot_product(vector1, vector2) == 0
+        assert isclose(Vector.angle_between_vectors(vector1, vector2), pi / 2)
+
+    def test_default_backend(self) -> None:
+        assert Matrix([[1]]).backend == DEFAULT_BACKEND
+        assert Vector([1]).backend == DEFAULT_BACKEND
+        with pytest.raises(ValueError):
+            Matrix([[1]], backend="fortran")
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed")
+    def test_mixed_backends(self) -> None:
+        numpy_matrix = Matrix([[1, 2], [3, 4]], backend="numpy")
+        python_matrix = Matrix([[1, 0], [0, 1]], backend="python")
+        assert (numpy_matrix * python_matrix).get() == [[1, 2], [3, 4]]
+        assert (python_matrix + numpy_matrix).get() == [[2, 2], [3, 5]]
+        assert isinstance((numpy_matrix * python_matrix).get()[0][0], float)
+
+
+class TestViews:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_transpose_is_view(self, backend: str) -> None:
+        matrix = Matrix([[1, 2, 3], [4, 5, 6]], backend=backend)
+        transposed = matrix.transpose()
+        assert transposed.shape == (3, 2)
+        assert transposed.strides == matrix.strides[::-1]
+        matrix[0, 1] = 10
+        assert transposed.get() == [[1, 4], [10, 5], [3, 6]]
+        assert transposed.transpose().get() == matrix.get()
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_slicing(self, backend: str) -> None:
+        matrix = Matrix(
+            [[i * 4 + j for j in range(4)] for i in range(3)], backend=backend
+        )
+        assert matrix[1, 2] == 6
+        assert matrix[-1, -1] == 11
+        assert matrix.row(1).get() == [[4, 5, 6, 7]]
+        assert matrix.column(2).get() == [[2], [6], [10]]
+        assert matrix[0:3:2, 1::2].get() == [[1, 3], [9, 11]]
+        assert matrix[1].get() == [[4, 5, 6, 7]]
+
+        view = matrix.transpose()[1:3, :]
+        assert view.get() == [[1, 5, 9], [2, 6, 10]]
+        view[0, 2] = -1
+        assert matrix[2, 1] == -1
+
+        with pytest.raises(IndexError):
+            matrix[3, 0]
+        with pytest.raises(IndexError):
+            matrix[2:2, :]
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_operations_on_views(self, backend: str) -> None:
+        matrix = Matrix([[1, 2], [3, 4]], backend=backend)
+        transposed = matrix.transpose()
+        assert (matrix + transposed).get() == [[2, 5], [5, 8]]
+        assert (transposed * matrix).get() == [[10, 14], [14, 20]]
+        copied = transposed.copy()
+        assert copied.strides == (2, 1)
+        copied[0, 0] = 0
+        assert matrix[0, 0] == 1
+
+    def test_flat_storage(self) -> None:
+        matrix = Matrix([[1, 2], [3, 4]], backend="python")
+        assert isinstance(matrix._data, array)
+        assert matrix._data.tolist() == [1, 2, 3, 4]
+        assert matrix.transpose()._data is matrix._data
+        assert matrix.get() == [[1, 2], [3, 4]]
+
+
+class TestStrassen:
+    @pytest.mark.parametrize(
+        "size,crossover,expected",
+        [(64, 64, 64), (65, 64, 66), (100, 16, 104), (7, 2, 8), (1, 1, 1)],
+    )
+    def test_padded_size(
+        self, size: int, crossover: int, expected: int
+    ) -> None:
+        assert strassen_size(size, crossover) == expected
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    @pytest.mark.parametrize("shape", [(8, 8, 8), (13, 21, 9), (30, 17, 25)])
+    def test_matches_classical(
+        self, backend: str, shape: tuple, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        count_rows, count_inner, count_columns = shape
+        left = [
+            [(i * 7 + j * 3) % 11 - 5 for j in range(count_inner)]
+            for i in range(count_rows)
+        ]
+        right = [
+            [(i * 5 + j * 2) % 13 - 6 for j in range(count_columns)]
+            for i in range(count_inner)
+        ]
+        expected = [
+            [
+                sum(left[i][k] * right[k][j] for k in range(count_inner))
+                for j in range(count_columns)
+            ]
+            for i in range(count_rows)
+        ]
+        monkeypatch.setitem(STRASSEN_CROSSOVER, backend, 2)
+        result = Matrix(left, backend=backend) * Matrix(right, backend=backend)
+        assert result.shape == (count_rows, count_columns)
+        assert result.get() == expected
+
+
+class TestParallelMatmul:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    @pytest.mark.parametrize("executor", ["thread", "process", None])
+    @pytest.mark.parametrize("workers", [1, 3, 8])
+    def test_matches_product(
+        self, backend: str, executor: Any, workers: int
+    ) -> None:
+        left = Matrix(
+            [[(i + j) % 5 for j in range(6)] for i in range(7)],
+            backend=backend,
+        )
+        right = Matrix(
+            [[(i * j) % 3 for j in range(4)] for i in range(6)],
+            backend=backend,
+        )
+        result = left.matmul(right, workers=workers, executor=executor)
+        assert result.backend == backend
+        assert result.get() == (left * right).get()
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_existing_pools(self, backend: str) -> None:
+        matrix = Matrix([[1, 2], [3, 4], [5, 6]], backend=backend)
+        expected = (matrix * matrix.transpose()).get()
+
+        pool = ThreadPool(num_threads=2)
+        assert matrix.matmul(matrix.transpose(), 2, pool).get() == expected
+        pool.dispose()
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = matrix.matmul(matrix.transpose(), 2, executor)
+        assert result.get() == expected
+
+    def test_invalid_arguments(self) -> None:
+        matrix = Matrix([[1, 2], [3, 4]])
+        with pytest.raises(ValueError):
+            matrix.matmul(matrix, workers=0)
+        with pytest.raises(ValueError):
+            matrix.matmul(matrix, workers=2, executor="gpu")
+        with pytest.raises(ValueError):
+            matrix.matmul(Matrix([[1, 2]]), workers=2)
+
+
+class TestMatrixVectorProducts:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_matvec_vecmat(self, backend: str) -> None:
+        matrix = Matrix([[1, 2, 3], [4, 5, 6]], backend=backend)
+        result = matrix * Vector([1, 0, -1], backend=backend)
+        assert isinstance(result, Vector)
+        assert result.get() == [-2, -2]
+        assert matrix.matvec(Vector([1, 1, 1])).get() == [6, 15]
+        assert (Vector([1, -1], backend=backend) * matrix).get() == [
+            -3,
+            -3,
+            -3,
+        ]
+        assert matrix.vecmat(Vector([0, 1])).get() == [4, 5, 6]
+
+        with pytest.raises(ValueError):
+            matrix * Vector([1, 2])
+        with pytest.raises(ValueError):
+            Vector([1, 2, 3]) * matrix
+
+
+class TestVectorBatch:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_batch_storage(self, backend: str) -> None:
+        batch = VectorBatch([[3, 4], Vector([1, 0]), [0, 2]], backend=backend)
+        assert len(batch) == 3
+        assert batch.dim == 2
+        assert batch[1].get() == [1, 0]
+        assert batch.norms() == [5, 1, 2]
+
+        with pytest.raises(TypeError):
+            VectorBatch([[1, 2], [3]])
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_pairwise_operations(self, backend: str) -> None:
+        vectors = [[1, 0], [0, 1], [1, 1], [-2, 0]]
+        batch = VectorBatch(vectors, backend=backend)
+        other = VectorBatch([[3, 4], [0, -1]], backend=backend)
+
+        dots = VectorBatch.dot_product(batch, other)
+        assert dots.shape == (4, 2)
+        assert dots.get() == [
+            [
+                Vector.dot_product(Vector(v), Vector(w))
+                for w in [[3, 4], [0, -1]]
+            ]
+            for v in vectors
+        ]
+
+        angles = VectorBatch.angle_between_vectors(batch)
+        assert angles.shape == (4, 4)
+        for i, v in enumerate(vectors):
+            assert isclose(angles[i, i], 0, abs_tol=1e-7)
+            for j, w in enumerate(vectors):
+                if i != j:
+                    expected = Vector.angle_between_vectors(
+                        Vector(v), Vector(w)
+                    )
+                    assert isclose(angles[i, j], expected)
+
+        with pytest.raises(ValueError):
+            VectorBatch.dot_product(batch, VectorBatch([[1, 2, 3]]))
+        with pytest.raises(ZeroDivisionError):
+            VectorBatch.angle_between_vectors(batch, VectorBatch([[0, 0]]))
+
+
+class TestInPlaceOperations:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_matrix_inplace(self, backend: str) -> None:
+        matrix = Matrix([[1, 2], [3, 4]], backend=backend)
+        data = matrix._data
+        matrix += Matrix([[1, 1], [1, 1]], backend=backend)
+        matrix *= 2
+        assert matrix._data is data
+        assert matrix.get() == [[4, 6], [8, 10]]
+
+        matrix.axpy(-0.5, Matrix([[8, 12], [16, 20]], backend=backend))
+        assert matrix.get() == [[0, 0], [0, 0]]
+
+        assert (3 * Matrix([[1, 2]], backend=backend)).get() == [[3, 6]]
+        product = Matrix([[1, 2]], backend=backend)
+        product *= Matrix([[1], [1]], backend=backend)
+        assert product.get() == [[3]]
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_matrix_out(self, backend: str) -> None:
+        matrix = Matrix([[1, 2], [3, 4]], backend=backend)
+        out = Matrix([[0, 0], [0, 0]], backend=backend)
+        assert matrix.add(matrix, out=out) is out
+        assert out.get() == [[2, 4], [6, 8]]
+        assert matrix.scale(-1, out=out).get() == [[-1, -2], [-3, -4]]
+
+        # The output may alias an operand in another layout
+        matrix.add(matrix.transpose(), out=matrix)
+        assert matrix.get() == [[2, 5], [5, 8]]
+
+        with pytest.raises(ValueError):
+            matrix.add(matrix, out=Matrix([[0, 0]], backend=backend))
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    @pytest.mark.parametrize("alpha,beta", [(1, 0), (2, 1), (-1, 0.5)])
+    def test_gemm(self, backend: str, alpha: float, beta: float) -> None:
+        a = Matrix([[1, 2, 3], [4, 5, 6]], backend=backend)
+        b = Matrix([[1, 0], [0, 1], [1, 1]], backend=backend)
+        c = Matrix([[1, 2], [3, 4]], backend=backend)
+        expected = [
+            [alpha * p + beta * q for p, q in zip(row_p, row_q)]
+            for row_p, row_q in zip((a * b).get(), c.get())
+        ]
+        work = Matrix([[0, 0], [0, 0]], backend=backend)
+        assert Matrix.gemm(alpha, a, b, beta, c, work) is c
+        assert c.get() == expected
+
+        with pytest.raises(ValueError):
+            Matrix.gemm(1, a, b, 0, Matrix([[0, 0]], backend=backend))
+        with pytest.raises(ValueError):
+            Matrix.gemm(1, c, c, 0, c)
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_vector_inplace(self, backend: str) -> None:
+        vector = Vector([1, 2, 3], backend=backend)
+        data = vector._data
+        vector += Vector([1, 1, 1], backend=backend)
+        vector *= 2
+        vector.axpy(-1, Vector([4, 6, 8], backend=backend))
+        assert vector._data is data
+        assert vector.get() == [0, 0, 0]
+
+        out = Vector([0, 0], backend=backend)
+        Vector([1, 2], backend=backend).add(Vector([3, 4]), out=out)
+        assert out.get() == [4, 6]
+        assert (2 * out).get() == (out * 2).get() == [8, 12]
+        with pytest.raises(ValueError):
+            out.add(out, out=vector)
+
+
+class TestChainMultiply:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_matches_left_to_right(self, backend: str) -> None:
+        shapes = [(6, 2), (2, 7), (7, 1), (1, 5)]
+        matrices = [
+            Matrix(
+                [[(i + 2 * j + k) % 4 for j in range(m)] for i in range(n)],
+                backend=backend,
+            )
+            for k, (n, m) in enumerate(shapes)
+        ]
+        expected = (
+            matrices[0] * matrices[1] * matrices[2] * matrices[3]
+        ).get()
+        assert Matrix.chain_multiply(*matrices).get() == expected
+        assert Matrix.chain_multiply(matrices[0]) is matrices[0]
+
+        with pytest.raises(ValueError):
+            Matrix.chain_multiply(matrices[0], matrices[0])
+        with pytest.raises(ValueError):
+            Matrix.chain_multiply()
+
+    def test_plans_are_cached(self) -> None:
+        matrices = [Matrix([[1] * 3] * 2), Matrix([[1] * 4] * 3)]
+        Matrix.chain_multiply(*matrices)
+        assert ((2, 3, 4),) in chain_order.dict_cache
+
+    def test_report(self) -> None:
+        a = Matrix([[1] * 100 for _ in range(10)])
+        b = Matrix([[1] * 5 for _ in range(100)])
+        c = Matrix([[1] * 50 for _ in range(5)])
+        report = Matrix.chain_report(a, b, c)
+        assert report["plan"] == "((M0 * M1) * M2)"
+        assert report["flops"] == 2 * (10 * 100 * 5 + 10 * 5 * 50)
+
+        report = Matrix.chain_report(
+            c.transpose(), b.transpose(), a.transpose()
+        )
+        assert report["plan"] == "(M0 * (M1 * M2))"
+        assert report["naive_flops"] == 2 * (50 * 5 * 100 + 50 * 100 * 10)
+        assert report["speedup"] == report["naive_flops"] / report["flops"]
+
+
+class TestTrustedConstruction:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_assume_valid(
+        self, backend: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def fail(list_of_lists: list) -> bool:
+            raise AssertionError("is_matrix must not be called")
+
+        matrix = Matrix([[1, 2], [3, 4]], backend=backend)
+        monkeypatch.setattr(Matrix, "is_matrix", staticmethod(fail))
+        trusted = Matrix([[1, 2], [3, 4]], backend=backend, assume_valid=True)
+        assert trusted.get() == [[1, 2], [3, 4]]
+
+        # Results of the operations are never re-validated
+        assert (matrix + trusted).get() == [[2, 4], [6, 8]]
+        assert (matrix * trusted).get() == [[7, 10], [15, 22]]
+        assert matrix.transpose().get() == [[1, 3], [2, 4]]
+        assert (matrix * Vector([1, 1])).get() == [3, 7]
+        with pytest.raises(AssertionError):
+            Matrix([[1, 2], [3, 4]], backend=backend)
+
+
+class TestLinearAlgebra:
+    SYSTEM = [[2, 1, 1, 0], [4, 3, 3, 1], [8, 7, 9, 5], [6, 7, 9, 8]]
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_lu_factors(self, backend: str) -> None:
+        matrix = Matrix(self.SYSTEM, backend=backend)
+        lu = matrix.lu()
+        permuted = [self.SYSTEM[p] for p in lu.perm]
+        product = (lu.L * lu.U).get()
+        for row, expected in zip(product, permuted):
+            assert all(
+                isclose(x, y, abs_tol=1e-9) for x, y in zip(row, expected)
+            )
+        assert all(lu.U[i, j] == 0 for i in range(4) for j in range(i))
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_solve_det_inverse(self, backend: str) -> None:
+        matrix = Matrix(self.SYSTEM, backend=backend)
+        x = matrix.solve(Vector([1, 2, 3, 4], backend=backend))
+        assert isinstance(x, Vector)
+        assert all(
+            isclose(value, expected, abs_tol=1e-9)
+            for value, expected in zip((matrix * x).get(), [1, 2, 3, 4])
+        )
+
+        rhs = Matrix([[1, 0], [0, 1], [2, 2], [3, -1]], backend=backend)
+        solutions = matrix.solve(rhs)
+        assert solutions.shape == (4, 2)
+        for row, expected in zip((matrix * solutions).get(), rhs.get()):
+            assert all(
+                isclose(x, y, abs_tol=1e-9) for x, y in zip(row, expected)
+            )
+
+        assert isclose(matrix.det(), 8)
+        identity = (matrix * matrix.inverse()).get()
+        for i, row in enumerate(identity):
+            assert all(
+                isclose(value, i == j, abs_tol=1e-9)
+                for j, value in enumerate(row)
+            )
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_cache_invalidation(self, backend: str) -> None:
+        matrix = Matrix([[2, 0], [0, 4]], backend=backend)
+        lu = matrix.lu()
+        assert matrix.lu() is lu
+        assert matrix.det() == 8
+
+        matrix[0, 0] = 3
+        assert matrix.lu() is not lu
+        assert matrix.det() == 12
+
+        matrix.transpose()[1, 1] = 1
+        assert matrix.det() == 3
+        matrix += Matrix([[1, 0], [0, 1]], backend=backend)
+        assert matrix.det() == 8
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_singular_and_invalid(self, backend: str) -> None:
+        singular = Matrix([[1, 2], [2, 4]], backend=backend)
+        assert singular.det() == 0
+        with pytest.raises(ValueError):
+            singular.solve(Vector([1, 1]))
+        with pytest.raises(ValueError):
+            singular.inverse()
+        with pytest.raises(ValueError):
+            Matrix([[1, 2, 3], [4, 5, 6]], backend=backend).lu()
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="numpy is not installed")
+    def test_blocked_matches_unblocked(self) -> None:
+        generator = Random(7)
+        rows = [[generator.uniform(-1, 1) for _ in range(9)] for _ in range(9)]
+        blocked = Matrix(rows, backend="numpy").lu(block_size=2)
+        unblocked = Matrix(rows, backend="python").lu()
+        assert blocked.perm == unblocked.perm
+        for row, expected in zip(blocked.lu.tolist(), unblocked.lu):
+            assert all(
+                isclose(x, y, abs_tol=1e-9) for x, y in zip(row, expected)
+            )
+
+
+class TestMatrixPower:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    @pytest.mark.parametrize("k", [0, 1, 2, 5, 8, 13])
+    def test_matches_repeated_products(self, backend: str, k: int) -> None:
+        matrix = Matrix([[1, 1], [1, 0]], backend=backend)
+        expected = Matrix([[1, 0], [0, 1]], backend=backend)
+        for _ in range(k):
+            expected = expected * matrix
+        assert (matrix**k).get() == expected.get()
+        assert matrix.get() == [[1, 1], [1, 0]]
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_negative_power(self, backend: str) -> None:
+        matrix = Matrix([[2, 0], [0, 4]], backend=backend)
+        assert matrix.power(-2).get() == [[0.25, 0], [0, 0.0625]]
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    @pytest.mark.parametrize("modulo", [10**9 + 7, 2**53])
+    def test_power_modulo(self, backend: str, modulo: int) -> None:
+        fibonacci = Matrix([[1, 1], [1, 0]], backend=backend)
+        # F(1000) computed with exact integers
+        previous, current = 0, 1
+        for _ in range(999):
+            previous, current = current, previous + current
+        result = pow(fibonacci, 1000, modulo)
+        assert result[0, 1] == current % modulo
+        assert result.backend == backend
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_markov_steady_state(self, backend: str) -> None:
+        transition = Matrix([[0.9, 0.1], [0.5, 0.5]], backend=backend)
+        steady = transition.power(10**6)
+        for row in steady.get():
+            assert isclose(row[0], 5 / 6) and isclose(row[1], 1 / 6)
+
+    def test_invalid_power(self) -> None:
+        with pytest.raises(ValueError):
+            Matrix([[1, 2, 3]]) ** 2
+        with pytest.raises(ValueError):
+            pow(Matrix([[0.5]]), 2, 7)
+        with pytest.raises(ValueError):
+            pow(Matrix([[1]]), -1, 7)
+        with pytest.raises(ValueError):
+            pow(Matrix([[1]]), 2, 2**54)
+
+
+class TestBinaryIO:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_buffer_round_trip(self, backend: str) -> None:
+        matrix = Matrix([[1, 2, 3], [4, 5, 6]], backend=backend)
+        data = bytearray(matrix.to_bytes())
+        assert len(data) == 6 * 8
+        shared = Matrix.from_buffer(data, (2, 3), backend=backend)
+        assert shared.get() == matrix.get()
+        view = shared.to_memoryview()
+        assert view.shape == (2, 3) and view.tolist() == matrix.get()
+
+        vector = Vector([1, 2, 3], backend=backend)
+        assert Vector.from_buffer(vector.to_bytes(), backend).get() == [
+            1,
+            2,
+            3,
+        ]
+        with pytest.raises(ValueError):
+            Matrix.from_buffer(data, (3, 3), backend=backend)
+
+    def test_from_buffer_shares_memory(self) -> None:
+        data = array("d", [1, 2, 3, 4])
+        matrix = Matrix.from_buffer(data, (2, 2), backend="python")
+        matrix[0, 1] = 10
+        assert data[1] == 10
+        assert (matrix + matrix).get() == [[2, 20], [6, 8]]
+        assert (
+            matrix.transpose().to_bytes()
+            == array("d", [1, 3, 10, 4]).tobytes()
+        )
+        with pytest.raises(BufferError):
+            matrix.transpose().to_memoryview()
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    @pytest.mark.parametrize("mmap", [False, True])
+    def test_save_load(self, backend: str, mmap: bool, tmp_path: Any) -> None:
+        path = str(tmp_path / "matrix.npy")
+        matrix = Matrix([[1, 2], [3, 4], [5, 6]], backend=backend)
+        matrix.transpose().save(path)
+        loaded = Matrix.load(path, mmap=mmap, backend=backend)
+        assert loaded.get() == [[1, 3, 5], [2, 4, 6]]
+        assert loaded.backend == backend
+        if mmap:
+            with pytest.raises((TypeError, ValueError)):
+                loaded[0, 0] = 7
+
+        path = str(tmp_path / "vector.npy")
+        Vector([1, 2, 3], backend=backend).save(path)
+        assert Vector.load(path, mmap=mmap, backend=backend).get() == [1, 2, 3]
+
+    @pytest.mark.skipif(not HAS_NUMPY, reason="NumPy is not installed")
+    def test_numpy_interop(self, tmp_path: Any) -> None:
+        import numpy as np
+
+        path = str(tmp_path / "matrix.npy")
+        Matrix([[1, 2], [3, 4]], backend="python").save(path)
+        assert np.load(path).tolist() == [[1, 2], [3, 4]]
+
+        np.save(path, np.asfortranarray([[1.0, 2.0], [3.0, 4.0]]))
+        assert Matrix.load(path, backend="python").get() == [[1, 2], [3, 4]]
+
+        matrix = Matrix([[1, 2], [3, 4]], backend="python")
+        assert np.asarray(matrix).tolist() == [[1, 2], [3, 4]]
+        assert np.asarray(matrix.transpose()).tolist() == [[1, 3], [2, 4]]
+        assert np.asarray(Vector([1, 2])).tolist() == [1, 2]
+
+
+class TestStableVectorMath:
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_norm_cache_invalidation(self, backend: str) -> None:
+        vector = Vector([3, 4], backend=backend)
+        assert vector.len() == 5
+        vector *= 2
+        assert vector.len() == 10
+        vector += Vector([-6, -8], backend=backend)
+        assert vector.len() == 0
+        vector.axpy(1, Vector([0, 2], backend=backend))
+        assert vector.len() == 2
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_overflow_and_underflow(self, backend: str) -> None:
+        for scale in (1e200, 1e-200):
+            vector = Vector([3 * scale, 4 * scale], backend=backend)
+            assert isclose(vector.len(), 5 * scale)
+            other = Vector([scale, 0], backend=backend)
+            angle = Vector.angle_between_vectors(vector, other)
+            assert isclose(angle, math.atan2(4, 3))
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_angle_clamped(self, backend: str) -> None:
+        vector = Vector([0.1, 0.2, 0.3], backend=backend)
+        same = Vector([0.1, 0.2, 0.3], backend=backend)
+        assert Vector.angle_between_vectors(vector, same) < 1e-7
+        opposite = Vector([-0.1, -0.2, -0.3], backend=backend)
+        assert isclose(Vector.angle_between_vectors(vector, opposite), pi)
+        with pytest.raises(ZeroDivisionError):
+            Vector.angle_between_vectors(vector, Vector([0, 0, 0]))
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_stable_variants(self, backend: str) -> None:
+        vector = Vector([1, 1e100, 1, -1e100], backend=backend)
+        ones = Vector([1, 1, 1, 1], backend=backend)
+        assert Vector.dot_product(vector, ones, stable=True) == 2
+
+        tiny = 1e-9
+        vector = Vector([1, 0], backend=backend)
+        other = Vector([math.cos(tiny), math.sin(tiny)], backend=backend)
+        angle = Vector.angle_between_vectors(vector, other, stable=True)
+        assert isclose(angle, tiny, rel_tol=1e-12)
+
+    @pytest.mark.parametrize("backend", AVAILABLE_BACKENDS)
+    def test_dot_and_norms(self, backend: str) -> None:
+        vector = Vector([3, 4], backend=backend)
+        other = Vector([4, 3], backend="python")
+        assert Vector.dot_and_norms(vector, other) == (24, 5, 5)
+        assert vector._norm == 5 and other._norm == 5
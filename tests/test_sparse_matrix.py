@@ -0,0 +1,99 @@
+import pytest
+
+from project.matrix_vector import Matrix, Vector
+from project.sparse_matrix import SparseMatrix
+
+
+@pytest.fixture
+def dense() -> list:
+    """A mostly zero 3x4 matrix."""
+    return [[0, 2, 0, 0], [0, 0, 0, 0], [1, 0, 0, 3]]
+
+
+def test_csr_storage(dense: list) -> None:
+    sparse = SparseMatrix(dense)
+    assert sparse.shape == (3, 4)
+    assert sparse.nnz == 3
+    assert sparse.values.tolist() == [2, 1, 3]
+    assert sparse.indices.tolist() == [1, 0, 3]
+    assert sparse.indptr.tolist() == [0, 1, 1, 3]
+    assert sparse.get() == dense
+
+    with pytest.raises(TypeError):
+        SparseMatrix([[1], [2, 3]])
+
+
+def test_coo_conversion(dense: list) -> None:
+    sparse = SparseMatrix.from_coo(
+        [2, 0, 2, 2], [3, 1, 0, 3], [1, 2, 1, 2], (3, 4)
+    )
+    assert sparse.get() == dense
+    assert sparse.to_coo() == ([0, 2, 2], [1, 0, 3], [2, 1, 3])
+
+    with pytest.raises(IndexError):
+        SparseMatrix.from_coo([3], [0], [1], (3, 4))
+
+
+def test_dense_conversion(dense: list) -> None:
+    sparse = SparseMatrix.from_dense(Matrix(dense))
+    assert sparse.nnz == 3
+    assert sparse.to_dense(backend="python").get() == dense
+
+
+def test_transpose(dense: list) -> None:
+    transposed = SparseMatrix(dense).transpose()
+    assert transposed.shape == (4, 3)
+    assert transposed.get() == Matrix(dense).transpose().get()
+
+
+def test_addition(dense: list) -> None:
+    sparse = SparseMatrix(dense)
+    other = SparseMatrix([[0, -2, 0, 0], [0, 5, 0, 0], [0, 0, 0, 0]])
+
+    result = sparse + other
+    assert isinstance(result, SparseMatrix)
+    assert result.nnz == 3
+    assert result.get() == [[0, 0, 0, 0], [0, 5, 0, 0], [1, 0, 0, 3]]
+
+    ones = Matrix([[1] * 4 for _ in range(3)])
+    expected = [[1, 3, 1, 1], [1, 1, 1, 1], [2, 1, 1, 4]]
+    assert (sparse + ones).get() == expected
+    assert (ones + sparse).get() == expected
+
+    with pytest.raises(ValueError):
+        sparse + sparse.transpose()
+
+
+def test_sparse_vector_product(dense: list) -> None:
+    result = SparseMatrix(dense) * Vector([1, 2, 3, 4])
+    assert isinstance(result, Vector)
+    assert result.get() == [4, 0, 13]
+
+    with pytest.raises(ValueError):
+        SparseMatrix(dense) * Vector([1, 2])
+
+
+def test_sparse_dense_products(dense: list) -> None:
+    sparse = SparseMatrix(dense)
+    matrix = Matrix([[1, 2], [3, 4], [5, 6], [7, 8]])
+    expected = (Matrix(dense) * matrix).get()
+
+    result = sparse * matrix
+    assert isinstance(result, Matrix)
+    assert result.get() == expected
+
+    left = Matrix([[1, 2, 3], [4, 5, 6]])
+    result = left * sparse
+    assert isinstance(result, Matrix)
+    assert result.get() == (left * Matrix(dense)).get()
+
+    with pytest.raises(ValueError):
+        sparse * sparse
+
+
+def test_sparse_sparse_product(dense: list) -> None:
+    sparse = SparseMatrix(dense)
+    result = sparse * sparse.transpose()
+    assert isinstance(result, SparseMatrix)
+    assert result.get() == (Matrix(dense) * Matrix(dense).transpose()).get()
+    assert result.nnz == 2